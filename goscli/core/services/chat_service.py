@@ -134,13 +134,7 @@ class ChatService:
             if response:
                 logger.debug(f"Response received of type: {type(response)}")
                 try:
-                    # Check if postprocess_response is async or not
-                    if asyncio.iscoroutinefunction(self.language_processor.postprocess_response):
-                        logger.debug("Calling async postprocess_response")
-                        response = await self.language_processor.postprocess_response(response)
-                    else:
-                        logger.debug("Calling sync postprocess_response")
-                        response = self.language_processor.postprocess_response(response)
+                    response = await self.language_processor.postprocess_response(response)
                     logger.debug("Language postprocessing completed successfully")
                 except Exception as e:
                     logger.error(f"Error during language postprocessing: {e}", exc_info=True)
@@ -592,6 +586,7 @@ class ChatService:
 
                 # 8. Call AI
                 response = await self._call_ai_with_retry(messages_for_api)
+                self.ui.stop_thinking()
                 ai_messages += 1
 
                 # 9. Handle potential API failure
@@ -101,6 +101,10 @@ class UserInterface(abc.ABC):
             **kwargs: Additional display options
         """
         pass
+
+    def stop_thinking(self) -> None:
+        """Clears the 'thinking' indicator shown by `display_thinking`, if any."""
+        pass
         
     def ask_yes_no_question(self, question: str) -> bool:
         """Asks a yes/no question and returns the answer.
@@ -1,40 +1,161 @@
 import logging
+import operator
+import re
 import time
 from datetime import datetime
-from typing import Optional, Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
 try:
     from typing import Protocol
 except ImportError:
     from typing_extensions import Protocol
 
+from rich.box import HEAVY, ROUNDED, SIMPLE
 from rich.console import Console
-from rich.markdown import Markdown
 from rich.panel import Panel
-from rich.box import ROUNDED, HEAVY, SIMPLE
+from rich.style import Style
 from rich.text import Text
-from rich.table import Table
-from rich.align import Align
+
+# Markdown, Table and Status are imported where they are used so that
+# command paths which never render them do not pay for the import.
+if TYPE_CHECKING:
+    from rich.status import Status
 
 from goscli.domain.interfaces.user_interface import UserInterface
-from goscli.domain.models.common import PromptText, ProcessedOutput
+from goscli.domain.models.common import ProcessedOutput, PromptText
 
 logger = logging.getLogger(__name__)
 
+# Characters that can start Markdown constructs; plain text skips the parser
+_MARKDOWN_HINT_RE = re.compile(r"[`#*_\[>]")
+_MARKDOWN_SCAN_CHARS = 512
+# Outputs above this size are rendered chunk by chunk without a Panel
+_LARGE_OUTPUT_CHARS = 64 * 1024
+
+# Role column styles for the chat history table (other roles use the assistant style)
+_ROLE_STYLES = {"user": "bold green", "assistant": "bold blue"}
+
+# Pre-parsed border styles and panel titles, so Rich does not re-parse them per call
+_STYLE_RED = Style.parse("red")
+_STYLE_BLUE = Style.parse("blue")
+_STYLE_YELLOW = Style.parse("yellow")
+_STYLE_CYAN = Style.parse("cyan")
+_STYLE_AI_THINKING = Style.parse("cyan on dark_blue")
+_STYLE_AI_CODE = Style.parse("purple on dark_blue")
+_STYLE_AI = Style.parse("blue on dark_blue")
+_STYLE_USER = Style.parse("green on dark_green")
+
+_TITLE_ERROR = Text.from_markup("[bold red]Error[/bold red]")
+_TITLE_INFO = Text.from_markup("[bold blue]Info[/bold blue]")
+_TITLE_WARNING = Text.from_markup("[bold yellow]Warning[/bold yellow]")
+_TITLE_QUESTION = Text.from_markup("[bold yellow]Question[/bold yellow]")
+_TITLE_DIAGRAM_SIZE = Text.from_markup("[bold blue]Diagram Size Selection[/bold blue]")
+
+
+def _has_markdown(text: str) -> bool:
+    """Returns True if the start of `text` contains Markdown syntax characters."""
+    return _MARKDOWN_HINT_RE.search(text, 0, _MARKDOWN_SCAN_CHARS) is not None
+
+
+def _format_duration(session_duration_secs: float) -> str:
+    """Formats a duration as 'HHh MMm SSs', or 'MMm SSs' under an hour."""
+    total = int(session_duration_secs)
+    if total >= 86400:
+        # gmtime wraps at 24h, so format whole hours separately
+        hours, rest = divmod(total, 3600)
+        return f"{hours}h " + time.strftime("%Mm %Ss", time.gmtime(rest))
+    fmt = "%Hh %Mm %Ss" if total >= 3600 else "%Mm %Ss"
+    return time.strftime(fmt, time.gmtime(total))
+
+
+def _split_markdown_chunks(text: str, chunk_size: int) -> Iterator[str]:
+    """Splits Markdown into chunks of roughly `chunk_size` characters.
+
+    Chunks end on a blank line outside fenced code blocks, so each chunk
+    renders the same as it would within the full document.
+    """
+    lines = text.splitlines(keepends=True)
+    start = 0
+    size = 0
+    in_fence = False
+    for i, line in enumerate(lines):
+        if line.lstrip().startswith(("```", "~~~")):
+            in_fence = not in_fence
+        size += len(line)
+        if size >= chunk_size and not in_fence and not line.strip():
+            yield "".join(lines[start:i + 1])
+            start = i + 1
+            size = 0
+    if start < len(lines):
+        yield "".join(lines[start:])
+
 class ConsoleDisplay(UserInterface):
     """Concrete implementation of UserInterface using the rich library for console output."""
 
+    # Shared Panel keyword arguments for the single-line message panels
+    _ERR_KW = {
+        "title": _TITLE_ERROR, "border_style": _STYLE_RED, "box": HEAVY,
+        "padding": (0, 1),
+    }
+    _INFO_KW = {
+        "title": _TITLE_INFO, "border_style": _STYLE_BLUE, "box": SIMPLE,
+        "padding": (0, 1),
+    }
+    _WARN_KW = {
+        "title": _TITLE_WARNING, "border_style": _STYLE_YELLOW, "box": HEAVY,
+        "padding": (0, 1),
+    }
+    _QUESTION_KW = {
+        "title": _TITLE_QUESTION, "border_style": _STYLE_YELLOW, "box": ROUNDED,
+        "padding": (0, 1),
+    }
+    _DIAGRAM_SIZE_KW = {
+        "title": _TITLE_DIAGRAM_SIZE, "border_style": _STYLE_BLUE, "box": ROUNDED,
+        "padding": (0, 1),
+    }
+
     def __init__(self):
-        """Initializes the rich Console."""
-        self._console = Console()
+        """Initializes display state; the rich Console is created on first use."""
+        self._console: Optional[Console] = None
         self.session_start_time = time.time()
         self.message_count = 0
         self.last_sender = None
+        self._thinking_status: Optional["Status"] = None
+        # Last formatted clock value, reused for messages within the same second
+        self._last_ts_second = -1
+        self._last_ts_str = ""
+        # Reused body for single-line panels; each panel renders before the next reuse
+        self._scratch_text = Text(style="white")
+        # ((provider_name, width), rendered text) of the last session header
+        self._cached_header: Optional[tuple] = None
+        # Prompt state, resolved on the first get_prompt call
+        self._is_tty: Optional[bool] = None
+        self._prompt_cache: Dict[str, Text] = {}
 
     @property
-    def console(self):
+    def console(self) -> Console:
         """Get the Rich console instance for direct operations."""
+        if self._console is None:
+            self._console = Console()
         return self._console
 
+    @console.setter
+    def console(self, console: Console) -> None:
+        self._console = console
+
+    def _panel_text(self, message: str) -> Text:
+        """Loads `message` into the shared scratch Text and returns it."""
+        self._scratch_text.plain = message
+        return self._scratch_text
+
+    def _current_time_str(self) -> str:
+        """Returns the current time as HH:MM:SS, formatting at most once per second."""
+        now = int(time.time())
+        if now != self._last_ts_second:
+            self._last_ts_second = now
+            self._last_ts_str = time.strftime("%H:%M:%S", time.localtime(now))
+        return self._last_ts_str
+
     def display_output(self, output: ProcessedOutput, **kwargs: Any) -> None:
         """Displays output text to the user, rendering Markdown with enhanced styling.
 
@@ -45,40 +166,46 @@ class ConsoleDisplay(UserInterface):
                 - style: Style override for the panel
                 - message_type: Type of message ("normal", "code", "thinking")
         """
+        self.stop_thinking()
         title = kwargs.get("title", "AI")
         message_type = kwargs.get("message_type", "normal")
         self.message_count += 1
+        output_str = str(output)
         
         # DEBUG: Log message details
-        logger.debug(f"display_output called: title={title}, message_type={message_type}, content_length={len(str(output))}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"display_output called: title={title}, message_type={message_type}, "
+                f"content_length={len(output_str)}"
+            )
         
         # Determine if this is a continuation of messages from the same sender
         is_continuation = self.last_sender == title
         self.last_sender = title
         
         # Get current timestamp
-        timestamp = datetime.now().strftime("%H:%M:%S")
+        timestamp = self._current_time_str()
         
         # Create different styling based on the sender and message type
         if title.lower() == "ai":
             # AI message styling
             if message_type == "thinking":
                 box_style = SIMPLE
-                style = "cyan on dark_blue"
+                style = _STYLE_AI_THINKING
                 title_style = "bold cyan"
                 timestamp_style = "dim cyan"
                 header = f"[{title_style}]{title} thinking...[/{title_style}] [dim]·[/dim] [{timestamp_style}]{timestamp}[/{timestamp_style}]"
                 logger.debug("Using 'thinking' message style")
             elif message_type == "code":
                 box_style = ROUNDED
-                style = "purple on dark_blue"
+                style = _STYLE_AI_CODE
                 title_style = "bold white"
                 timestamp_style = "dim white"
                 header = f"[{title_style}]{title} [bright_purple]code[/bright_purple][/{title_style}] [dim]·[/dim] [{timestamp_style}]{timestamp}[/{timestamp_style}]"
                 logger.debug("Using 'code' message style")
             else:
                 box_style = ROUNDED
-                style = "blue on dark_blue"
+                style = _STYLE_AI
                 title_style = "bold white"
                 timestamp_style = "dim white"
                 header = f"[{title_style}]{title}[/{title_style}] [dim]·[/dim] [{timestamp_style}]{timestamp}[/{timestamp_style}]"
@@ -86,7 +213,7 @@ class ConsoleDisplay(UserInterface):
         else:
             # User message styling
             box_style = SIMPLE
-            style = "green on dark_green"
+            style = _STYLE_USER
             title_style = "bold white"
             timestamp_style = "dim white"
             header = f"[{title_style}]{title}[/{title_style}] [dim]·[/dim] [{timestamp_style}]{timestamp}[/{timestamp_style}]"
@@ -97,13 +224,25 @@ class ConsoleDisplay(UserInterface):
             logger.debug("Adding spacing for new message (not continuation)")
             self.console.print("")
         
-        # Process content for enhanced code block rendering
-        output_str = str(output)
-        
         try:
+            if len(output_str) > _LARGE_OUTPUT_CHARS:
+                # Stream very large outputs chunk by chunk instead of buffering
+                # the whole rendered text inside a single Panel
+                from rich.markdown import Markdown
+                self.console.print(Text.from_markup(header))
+                for chunk in _split_markdown_chunks(output_str, _LARGE_OUTPUT_CHARS):
+                    self.console.print(Markdown(chunk))
+                logger.debug("Displayed large message in chunks")
+                return
+
             # Create a panel with the message content
+            if _has_markdown(output_str):
+                from rich.markdown import Markdown
+                content = Markdown(output_str)
+            else:
+                content = Text(output_str, style="white")
             panel = Panel(
-                Markdown(output_str),
+                content,
                 title=header,
                 title_align="left",
                 border_style=style,
@@ -129,18 +268,28 @@ class ConsoleDisplay(UserInterface):
         Returns:
             The text input by the user.
         """
+        self.stop_thinking()
+        # Add a small spacing before input, but only after a real message
+        if self.last_sender is not None:
+            self.console.print("")
+
         # Reset last sender when prompting for input
         self.last_sender = None
-        
-        # Create a nicely styled input prompt
-        prompt_style = "[bold green on dark_green]"
-        end_style = "[/bold green on dark_green]"
-        
-        # Add a small spacing before input
-        self.console.print("")
-        
-        # Get user input with styled prompt
-        user_input = self.console.input(f"{prompt_style} {prompt_message} {end_style} ")
+
+        if self._is_tty is None:
+            self._is_tty = self.console.is_terminal
+        if self._is_tty:
+            # Styled prompt, parsed from markup once per distinct prompt message
+            prompt = self._prompt_cache.get(prompt_message)
+            if prompt is None:
+                prompt = self._prompt_cache[prompt_message] = Text.from_markup(
+                    f"[bold green on dark_green] {prompt_message} "
+                    "[/bold green on dark_green] "
+                )
+            user_input = self.console.input(prompt)
+        else:
+            # Scripted/piped input: skip Rich entirely
+            user_input = input(prompt_message)
         
         # Increment message counter for consistency
         self.message_count += 1
@@ -153,13 +302,8 @@ class ConsoleDisplay(UserInterface):
         Args:
             error_message: The error message to display.
         """
-        panel = Panel(
-            Text(error_message, style="white"),
-            title="[bold red]Error[/bold red]",
-            border_style="red",
-            box=HEAVY,
-            padding=(0, 1)
-        )
+        self.stop_thinking()
+        panel = Panel(self._panel_text(error_message), **self._ERR_KW)
         self.console.print(panel)
 
     def display_info(self, info_message: str, **kwargs: Any) -> None:
@@ -168,13 +312,8 @@ class ConsoleDisplay(UserInterface):
         Args:
             info_message: The informational message to display.
         """
-        panel = Panel(
-            Text(info_message, style="white"),
-            title="[bold blue]Info[/bold blue]",
-            border_style="blue",
-            box=SIMPLE,
-            padding=(0, 1)
-        )
+        self.stop_thinking()
+        panel = Panel(self._panel_text(info_message), **self._INFO_KW)
         self.console.print(panel)
 
     def display_warning(self, warning_message: str, **kwargs: Any) -> None:
@@ -183,14 +322,9 @@ class ConsoleDisplay(UserInterface):
         Args:
             warning_message: The warning message to display.
         """
+        self.stop_thinking()
         logger.warning(f"Display warning: {warning_message}")
-        panel = Panel(
-            Text(warning_message, style="white"),
-            title="[bold yellow]Warning[/bold yellow]",
-            border_style="yellow",
-            box=HEAVY,
-            padding=(0, 1)
-        )
+        panel = Panel(self._panel_text(warning_message), **self._WARN_KW)
         self.console.print(panel)
 
     def display_session_header(self, provider_name: str = "AI") -> None:
@@ -200,10 +334,25 @@ class ConsoleDisplay(UserInterface):
             provider_name: Name of the AI provider
         """
         logger.debug(f"Displaying session header for provider: {provider_name}")
+        self.stop_thinking()
         try:
+            console = self.console
+            cache_key = (provider_name, console.width)
+            if self._cached_header is not None and self._cached_header[0] == cache_key:
+                # Replay the header rendered earlier in this process as one write
+                console.file.write(self._cached_header[1])
+                console.file.flush()
+                logger.debug("Session header replayed from cache")
+                return
+
+            from rich.table import Table
+
             # Create a header table
-            table = Table(show_header=False, box=ROUNDED, border_style="cyan", padding=(0, 1))
-            table.add_column("Content", style="cyan")
+            table = Table(
+                expand=False, show_header=False, box=ROUNDED, border_style="cyan",
+                padding=(0, 1),
+            )
+            table.add_column("Content", style="cyan", justify="center")
             
             # Add session info rows
             table.add_row(f"[bold cyan]GosCLI Interactive Chat Session[/bold cyan]")
@@ -211,11 +360,15 @@ class ConsoleDisplay(UserInterface):
             table.add_row(f"Session started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             table.add_row("Type 'exit' or 'quit' to end the session")
             
-            # Create a centered aligned panel
-            aligned_table = Align.center(table)
-            self.console.print("")
-            self.console.print(aligned_table)
-            self.console.print("")
+            # Center in a single pass; render once and write in a single call
+            with console.capture() as capture:
+                console.print("")
+                console.print(table, justify="center")
+                console.print("")
+            rendered = capture.get()
+            self._cached_header = (cache_key, rendered)
+            console.file.write(rendered)
+            console.file.flush()
             logger.debug("Session header displayed successfully")
         except Exception as e:
             logger.error(f"Error displaying session header: {e}")
@@ -234,14 +387,16 @@ class ConsoleDisplay(UserInterface):
         """
         logger.debug(f"Displaying session footer: {message_count} messages, {session_duration_secs:.2f} seconds")
         try:
-            # Format duration nicely
-            minutes, seconds = divmod(int(session_duration_secs), 60)
-            hours, minutes = divmod(minutes, 60)
-            duration_str = f"{hours}h {minutes}m {seconds}s" if hours else f"{minutes}m {seconds}s"
+            from rich.table import Table
+
+            duration_str = _format_duration(session_duration_secs)
             
             # Create a footer table
-            table = Table(show_header=False, box=SIMPLE, border_style="cyan", padding=(0, 1))
-            table.add_column("Content", style="cyan")
+            table = Table(
+                expand=False, show_header=False, box=SIMPLE, border_style="cyan",
+                padding=(0, 1),
+            )
+            table.add_column("Content", style="cyan", justify="center")
             
             # Add session summary
             table.add_row(f"[bold cyan]Chat Session Summary[/bold cyan]")
@@ -249,10 +404,9 @@ class ConsoleDisplay(UserInterface):
             table.add_row(f"Session duration: [bold]{duration_str}[/bold]")
             table.add_row(f"Session ended at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             
-            # Create a centered aligned panel
-            aligned_table = Align.center(table)
+            # Center in a single pass
             self.console.print("")
-            self.console.print(aligned_table)
+            self.console.print(table, justify="center")
             self.console.print("")
             logger.debug("Session footer displayed successfully")
         except Exception as e:
@@ -260,9 +414,7 @@ class ConsoleDisplay(UserInterface):
             # Fallback to simple text
             self.console.print("\n=== Chat Session Summary ===")
             self.console.print(f"Messages exchanged: {message_count}")
-            minutes, seconds = divmod(int(session_duration_secs), 60)
-            hours, minutes = divmod(minutes, 60)
-            duration_str = f"{hours}h {minutes}m {seconds}s" if hours else f"{minutes}m {seconds}s"
+            duration_str = _format_duration(session_duration_secs)
             self.console.print(f"Session duration: {duration_str}")
             self.console.print(f"Session ended at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
@@ -276,6 +428,8 @@ class ConsoleDisplay(UserInterface):
         logger.debug(f"Displaying chat history with {len(history)} messages")
         
         try:
+            from rich.table import Table
+
             # Create a table for the chat history
             table = Table(show_header=True, box=ROUNDED, border_style="cyan", padding=(0, 1))
             table.add_column("#", style="cyan", justify="right")
@@ -283,52 +437,54 @@ class ConsoleDisplay(UserInterface):
             table.add_column("Role", style="bold")
             table.add_column("Message", style="white")
             
-            # Add each message to the table
-            for i, message in enumerate(history, 1):
+            # Build all rows first; a failing message gets an error row
+            get_fields = operator.attrgetter("role", "timestamp", "content")
+            rows = []
+            time_strs: Dict[int, str] = {}  # formatted once per distinct second
+            for index, msg in enumerate(history, 1):
                 try:
-                    # Get message properties
-                    role = message.role.capitalize()
-                    timestamp = datetime.fromtimestamp(message.timestamp).strftime("%H:%M:%S")
-                    
-                    # Format the content (truncate if too long)
-                    content = str(message.content)
+                    role, timestamp, content = get_fields(msg)
+                    content = str(content)
                     if len(content) > 100:
-                        content = content[:97] + "..."
-                    
-                    # Apply styling based on role
-                    role_style = "bold green" if role.lower() == "user" else "bold blue"
-                    
-                    # Add row to table
-                    table.add_row(
-                        str(i),
-                        timestamp,
-                        f"[{role_style}]{role}[/{role_style}]",
-                        content
-                    )
-                    logger.debug(f"Added history message {i}: {role} at {timestamp}")
+                        content = f"{content[:97]}..."
+                    role_style = _ROLE_STYLES.get(role.lower(), "bold blue")
+                    second = int(timestamp)
+                    time_str = time_strs.get(second)
+                    if time_str is None:
+                        time_str = time.strftime("%H:%M:%S", time.localtime(second))
+                        time_strs[second] = time_str
+                    rows.append((
+                        str(index),
+                        time_str,
+                        f"[{role_style}]{role.capitalize()}[/{role_style}]",
+                        content,
+                    ))
                 except AttributeError as e:
-                    logger.error(f"Error accessing message attributes for history item {i}: {e}")
-                    # Add a row with error information
-                    table.add_row(
-                        str(i),
-                        "???",
-                        "[bold red]Error[/bold red]",
-                        f"Could not display message: {e}"
+                    logger.error(
+                        "Error accessing message attributes for history item "
+                        f"{index}: {e}"
                     )
+                    rows.append((
+                        str(index), "???", "[bold red]Error[/bold red]",
+                        f"Could not display message: {e}",
+                    ))
                 except Exception as e:
-                    logger.error(f"Unexpected error processing history item {i}: {e}")
-                    table.add_row(
-                        str(i),
-                        "???",
-                        "[bold red]Error[/bold red]",
-                        f"Unexpected error: {e}"
+                    logger.error(
+                        f"Unexpected error processing history item {index}: {e}"
                     )
+                    rows.append((
+                        str(index), "???", "[bold red]Error[/bold red]",
+                        f"Unexpected error: {e}",
+                    ))
+
+            for row in rows:
+                table.add_row(*row)
             
             # Create a header
             self.console.print("")
             self.console.print(Panel(
                 Text("Chat History", justify="center"),
-                border_style="cyan",
+                border_style=_STYLE_CYAN,
                 box=SIMPLE
             ))
             
@@ -342,20 +498,38 @@ class ConsoleDisplay(UserInterface):
 
     def display_thinking(self, **kwargs: Any) -> None:
         """Displays a 'thinking' indicator while the AI is processing.
-        
+
+        Renders a transient spinner line instead of a full message panel. The
+        spinner is created on first use and reused for later turns; it is
+        cleared by `stop_thinking` or by the next message printed.
+
         Args:
             **kwargs: Additional display options like message
         """
         logger.debug(f"Displaying thinking indicator with kwargs: {kwargs}")
         message = kwargs.get("message", "Thinking...")
+        status_text = f"[bold cyan]AI[/bold cyan] [cyan]{message}[/cyan]"
         try:
-            self.display_output(message, title="AI", message_type="thinking")
+            if self._thinking_status is None:
+                from rich.status import Status
+                self._thinking_status = Status(
+                    status_text, console=self.console, spinner="dots",
+                    spinner_style="cyan",
+                )
+            else:
+                self._thinking_status.update(status_text)
+            self._thinking_status.start()
             logger.debug("Thinking indicator displayed successfully")
         except Exception as e:
             logger.error(f"Error displaying thinking indicator: {e}", exc_info=True)
             # Fallback to simple text
             self.console.print(f"\nAI is {message}\n")
 
+    def stop_thinking(self) -> None:
+        """Clears the 'thinking' indicator if it is currently shown."""
+        if self._thinking_status is not None:
+            self._thinking_status.stop()
+
     def ask_yes_no_question(self, question: str) -> bool:
         """Asks a yes/no question and returns the answer.
         
@@ -365,17 +539,12 @@ class ConsoleDisplay(UserInterface):
         Returns:
             True if the answer is yes, False otherwise
         """
+        self.stop_thinking()
         logger.debug(f"Asking yes/no question: {question}")
         
         try:
             # Create a styled panel for the question
-            panel = Panel(
-                Text(f"{question} (y/n)", style="white"),
-                title="[bold yellow]Question[/bold yellow]",
-                border_style="yellow",
-                box=ROUNDED,
-                padding=(0, 1)
-            )
+            panel = Panel(self._panel_text(f"{question} (y/n)"), **self._QUESTION_KW)
             
             # Print the question panel
             self.console.print(panel)
@@ -399,16 +568,18 @@ class ConsoleDisplay(UserInterface):
         Returns:
             The selected size (width/height in pixels)
         """
+        self.stop_thinking()
         logger.debug("Asking for diagram size selection")
         
         try:
             # Create a styled panel with size options
             panel = Panel(
-                Text("Select diagram size:\n1. Small (1000x1000 pixels)\n2. Medium (2000x2000 pixels)\n3. Large (4000x4000 pixels) [default]", style="white"),
-                title="[bold blue]Diagram Size Selection[/bold blue]",
-                border_style="blue",
-                box=ROUNDED,
-                padding=(0, 1)
+                self._panel_text(
+                    "Select diagram size:\n1. Small (1000x1000 pixels)\n"
+                    "2. Medium (2000x2000 pixels)\n"
+                    "3. Large (4000x4000 pixels) [default]"
+                ),
+                **self._DIAGRAM_SIZE_KW
             )
             
             # Print the options panel
@@ -5,22 +5,15 @@ a dedicated configuration file (e.g., .goscli/config.yaml).
 Implements the ConfigurationProvider interface (or provides static functions).
 """
 
+import functools
+import io
 import logging
 import os
+import re
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Optional, Dict, Union
-
-try:
-    from dotenv import load_dotenv
-except ImportError:
-    load_dotenv = None
-    logging.getLogger(__name__).warning("python-dotenv not installed. .env file support disabled.")
-
-try:
-    import yaml
-except ImportError:
-    yaml = None
-    logging.getLogger(__name__).warning("PyYAML not installed. YAML config file support disabled.")
+from typing import Any, Callable, Optional, Dict, Tuple, Union
 
 # Domain Layer Imports (optional, if implementing interface)
 # from ...domain.interfaces.config import ConfigurationProvider
@@ -37,8 +30,68 @@ ENV_FILE_NAME = ".env"
 _config: Dict[str, Any] = {}
 _test_config = {}  # For testing purposes
 _loaded = False
+_dotenv_loaded = False  # Shared sentinel so the .env file is only read once
+_load_lock = threading.Lock()
+# Config files already known to be absent (skips the exists() stat on reload)
+_missing_config_files: set = set()
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Per-process view of the settings read on every AI turn."""
+    use_indonesian: bool
+    cot_in_english: bool
+    default_provider: str
+    default_model: Optional[str]
+    openai_api_key: Optional[str]
+    groq_api_key: Optional[str]
+
+
+_SNAPSHOT: Optional[ConfigSnapshot] = None
+
+# Memoized non-environment get_config results keyed by (key, default);
+# cleared on config changes
+_MISSING = object()
+_resolved_cache: Dict[tuple, Any] = {}
 
-def load_configuration(config_file: Path = DEFAULT_CONFIG_FILE, env_file: Optional[Path] = None) -> None:
+# Coercion of environment variable strings
+_BOOL_MAP = {'true': True, 'false': False}
+_NUM_RE = re.compile(r'^-?\d+(\.\d+)?$')
+# Values the fast pattern rejects are only tried with int()/float() if they
+# contain a digit, since nothing without one can convert
+_DIGIT_RE = re.compile(r'\d')
+
+# Derived environment variable names, filled lazily per config key
+_env_key_cache: Dict[str, str] = {}  # key -> KEY (read by get_config)
+_goscli_env_cache: Dict[str, str] = {}  # key -> GOSCLI_KEY (written by set_config)
+
+# PyYAML and python-dotenv are imported on first use, and only when a config
+# file or .env file actually exists, to keep CLI startup cheap.
+@functools.lru_cache(maxsize=1)
+def _import_yaml():
+    """Returns the yaml module, or None if PyYAML is not installed."""
+    try:
+        import yaml
+    except ImportError:
+        logger.warning("PyYAML not installed. YAML config file support disabled.")
+        return None
+    return yaml
+
+@functools.lru_cache(maxsize=1)
+def _import_load_dotenv():
+    """Returns dotenv.load_dotenv, or None if python-dotenv is not installed."""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        logger.warning("python-dotenv not installed. .env file support disabled.")
+        return None
+    return load_dotenv
+
+def load_configuration(
+    config_file: Path = DEFAULT_CONFIG_FILE,
+    env_file: Optional[Path] = None,
+    force: bool = False,
+) -> None:
     """Loads configuration from environment, .env file, and YAML file.
 
     Priority order (highest to lowest):
@@ -50,48 +103,138 @@ def load_configuration(config_file: Path = DEFAULT_CONFIG_FILE, env_file: Option
     Args:
         config_file: Path to the YAML configuration file.
         env_file: Path to the .env file (searches upwards from cwd if None).
+        force: Reload even if configuration was already loaded. The YAML file
+               is only re-parsed if its modification time changed.
     """
-    global _config, _test_config, _loaded
-    if _loaded:
+    if _loaded and not force:
         logger.debug("Configuration already loaded.")
         return
 
+    with _load_lock:
+        if _loaded and not force:
+            logger.debug("Configuration already loaded.")
+            return
+        if force:
+            _missing_config_files.discard(config_file)
+        _load_configuration_locked(config_file, env_file)
+
+def _load_configuration_locked(config_file: Path, env_file: Optional[Path]) -> None:
+    """Performs the actual loading; callers must hold `_load_lock`."""
+    global _config, _loaded
     _config = {}
 
+    # Work out which files need reading first, so both reads can overlap
+    tasks: Dict[str, tuple] = {}
+    yaml_task = _yaml_read_task(config_file)
+    if yaml_task is not None:
+        tasks['yaml'] = yaml_task
+    dotenv_path, load_dotenv = _dotenv_loader(env_file)
+    if load_dotenv:
+        tasks['env'] = (_read_text, dotenv_path)
+
+    results = _run_io_tasks(tasks)
+
     # 1. Load from YAML file (Lowest priority)
-    if yaml and config_file.exists():
-        try:
-            # Ensure config directory exists
-            config_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(config_file, 'r') as f:
-                yaml_config = yaml.safe_load(f)
-                if isinstance(yaml_config, dict):
-                    _config.update(yaml_config)
-                    logger.info(f"Loaded configuration from YAML: {config_file}")
-                elif yaml_config is not None:
-                    logger.warning(f"YAML config file {config_file} did not contain a dictionary.")
-        except Exception as e:
-            logger.error(f"Failed to load or parse YAML config {config_file}: {e}")
-    elif yaml:
-        logger.debug(f"YAML config file not found: {config_file}")
+    if 'yaml' in results:
+        _apply_yaml_config(config_file, results['yaml'])
 
-    # 2. Load from .env file (Medium priority)
-    if load_dotenv:
-        dotenv_path = env_file or find_dotenv_path()
-        if dotenv_path:
-            loaded_from_env = load_dotenv(dotenv_path=dotenv_path, override=False) # override=False: ENV VARS take precedence
-            if loaded_from_env:
-                logger.info(f"Loaded environment variables from: {dotenv_path}")
-            else:
-                 logger.debug(f".env file not found at or above current directory.")
-        else:
-            logger.debug("Skipping .env file loading (path not found or specified as None).")
+    # 2. Load from .env file (Medium priority), at most once per process
+    if 'env' in results:
+        _apply_dotenv(dotenv_path, load_dotenv, results['env'])
+    elif not _dotenv_loaded:
+        logger.debug("Skipping .env file loading (path not found or specified as None).")
 
     # 3. Environment Variables (Highest priority) are handled by os.getenv in get_config
 
     _loaded = True
+    _invalidate_config_caches()
     logger.info("Configuration loading process completed.")
 
+def _yaml_read_task(config_file: Path) -> Optional[tuple]:
+    """Returns the YAML config read task, or None if there is nothing to read."""
+    if config_file in _missing_config_files:
+        return None
+    try:
+        mtime = config_file.stat().st_mtime_ns
+    except OSError:
+        _missing_config_files.add(config_file)
+        logger.debug(f"YAML config file not found: {config_file}")
+        return None
+    if not _import_yaml():
+        return None
+    return (_parse_yaml, str(config_file), mtime)
+
+def _dotenv_loader(
+    env_file: Optional[Path],
+) -> Tuple[Optional[Path], Optional[Callable]]:
+    """Returns the .env path and python-dotenv's loader, or Nones if not loading."""
+    if _dotenv_loaded:
+        return None, None
+    dotenv_path = env_file or find_dotenv_path()
+    return dotenv_path, (_import_load_dotenv() if dotenv_path else None)
+
+def _apply_yaml_config(config_file: Path, yaml_config: Any) -> None:
+    """Merges a parsed YAML config (or logs why it could not be used)."""
+    if isinstance(yaml_config, Exception):
+        logger.error(
+            f"Failed to load or parse YAML config {config_file}: {yaml_config}"
+        )
+    elif isinstance(yaml_config, dict):
+        _config.update(yaml_config)
+        logger.info(f"Loaded configuration from YAML: {config_file}")
+    elif yaml_config is not None:
+        logger.warning(f"YAML config file {config_file} did not contain a dictionary.")
+
+def _apply_dotenv(dotenv_path: Path, load_dotenv: Callable, env_text: Any) -> None:
+    """Loads .env contents into os.environ without overriding existing variables."""
+    global _dotenv_loaded
+    if isinstance(env_text, Exception):
+        logger.warning(f"Failed to read .env file {dotenv_path}: {env_text}")
+        return
+    # override=False: ENV VARS take precedence
+    loaded_from_env = load_dotenv(stream=io.StringIO(env_text), override=False)
+    _dotenv_loaded = True
+    if loaded_from_env:
+        logger.info(f"Loaded environment variables from: {dotenv_path}")
+    else:
+        logger.debug(f".env file at {dotenv_path} did not set any variables.")
+
+def _read_text(path: Union[str, Path]) -> str:
+    """Reads a UTF-8 text file in one call."""
+    with open(path, 'rb') as f:
+        return f.read().decode('utf-8')
+
+def _run_io_tasks(tasks: Dict[str, tuple]) -> Dict[str, Any]:
+    """Runs named ``(func, *args)`` calls, overlapping them when there are several.
+
+    Exceptions are returned in place of results so callers can log them per source.
+    """
+    def call(task: tuple) -> Any:
+        func, *args = task
+        try:
+            return func(*args)
+        except Exception as e:
+            return e
+
+    if len(tasks) < 2:
+        return {name: call(task) for name, task in tasks.items()}
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = {name: executor.submit(call, task) for name, task in tasks.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+@functools.lru_cache(maxsize=8)
+def _parse_yaml(path: str, mtime_ns: int) -> Any:
+    """Parses a YAML file with the fastest available safe loader.
+
+    Cached per (path, mtime_ns), so the file is only re-parsed after it changes.
+    """
+    yaml = _import_yaml()
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=loader)
+
 def get_config(key: str, default: Any = None) -> Any:
     """
     Get a configuration value by key.
@@ -109,26 +252,33 @@ def get_config(key: str, default: Any = None) -> Any:
     Returns:
         The configuration value
     """
+    if not _loaded:
+        ensure_loaded()
+    if key not in _test_config:
+        # The environment can change at runtime, so it is read on every call;
+        # only the string coercion is cached (per raw value)
+        raw = os.environ.get(_env_name(key))
+        if raw is not None:
+            return _coerce_env_value(raw)
+    try:
+        cache_key = (key, default)
+        cached = _resolved_cache.get(cache_key, _MISSING)
+    except TypeError:  # unhashable default, resolve without caching
+        return _resolve_config(key, default)
+    if cached is _MISSING:
+        cached = _resolved_cache[cache_key] = _resolve_config(key, default)
+    return cached
+
+def _resolve_config(key: str, default: Any) -> Any:
+    """Looks `key` up in test config, environment and loaded config (uncached)."""
     # First check test config
     if key in _test_config:
         return _test_config[key]
     
     # Then check environment variables (convert to uppercase for env vars)
-    env_key = key.upper()
-    if env_key in os.environ:
-        value = os.environ[env_key]
-        # Try to convert common types
-        if value.lower() == 'true':
-            return True
-        elif value.lower() == 'false':
-            return False
-        try:
-            if '.' in value:
-                return float(value)
-            else:
-                return int(value)
-        except (ValueError, TypeError):
-            return value
+    raw = os.environ.get(_env_name(key))
+    if raw is not None:
+        return _coerce_env_value(raw)
     
     # Then check loaded config
     if key in _config:
@@ -138,43 +288,133 @@ def get_config(key: str, default: Any = None) -> Any:
     logger.debug(f"Config key '{key}' not found in environment or loaded config. Returning default: {default}")
     return default
 
+def _env_name(key: str) -> str:
+    """Returns the environment variable name for a config key."""
+    env_key = _env_key_cache.get(key)
+    if env_key is None:
+        env_key = _env_key_cache.setdefault(key, key.upper())
+    return env_key
+
+@functools.lru_cache(maxsize=64)
+def _coerce_env_value(value: str) -> Any:
+    """Converts common types via lookup table / numeric pattern."""
+    flag = _BOOL_MAP.get(value.lower())
+    if flag is not None:
+        return flag
+    if _NUM_RE.match(value):
+        return float(value) if '.' in value else int(value)
+    if _DIGIT_RE.search(value):
+        # Other forms int()/float() accept ('+5', ' 5', '.5', '1_000')
+        try:
+            return float(value) if '.' in value else int(value)
+        except ValueError:
+            pass
+    return value
+
 def find_dotenv_path() -> Optional[Path]:
     """Searches for the .env file upwards from the current directory."""
-    if not load_dotenv:
-        return None
     try:
-        # Check current directory and parents
-        cwd = Path.cwd()
-        for path in [cwd] + list(cwd.parents):
-            env_path = path / ENV_FILE_NAME
-            if env_path.is_file():
-                return env_path
+        return _find_dotenv_from(os.getcwd())
     except Exception as e:
         logger.warning(f"Error searching for .env file: {e}")
     return None
 
+@functools.lru_cache(maxsize=1)
+def _find_dotenv_from(start_dir: str) -> Optional[Path]:
+    """Walks up from ``start_dir`` using plain string paths (memoized per cwd)."""
+    current = start_dir
+    while True:
+        candidate = os.path.join(current, ENV_FILE_NAME)
+        if os.path.isfile(candidate):
+            return Path(candidate)
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+# --- Config Snapshot ---
+
+def get_snapshot() -> ConfigSnapshot:
+    """Returns the cached ConfigSnapshot, building it on first use."""
+    global _SNAPSHOT
+    snapshot = _SNAPSHOT
+    if snapshot is None:
+        snapshot = _SNAPSHOT = ConfigSnapshot(
+            use_indonesian=_resolve_use_indonesian(),
+            cot_in_english=_resolve_cot_in_english(),
+            default_provider=_resolve_default_provider(),
+            default_model=_resolve_default_model(),
+            openai_api_key=_resolve_openai_api_key(),
+            groq_api_key=_resolve_groq_api_key(),
+        )
+    return snapshot
+
+def _invalidate_config_caches() -> None:
+    """Drops resolved config values and the snapshot so lookups re-resolve them."""
+    global _SNAPSHOT
+    _resolved_cache.clear()
+    _SNAPSHOT = None
+
 # --- Convenience Functions --- 
 
 def get_openai_api_key() -> Optional[str]:
     """Convenience function to get the OpenAI API key."""
+    return get_snapshot().openai_api_key
+
+def get_groq_api_key() -> Optional[str]:
+    """Convenience function to get the Groq API key."""
+    return get_snapshot().groq_api_key
+
+def get_default_provider() -> str:
+    """Gets the default AI provider."""
+    return get_snapshot().default_provider
+
+def get_default_model(provider: Optional[str] = None) -> Optional[str]:
+    """Gets the default model for a given provider."""
+    if provider is None:
+        return get_snapshot().default_model
+    return _resolve_default_model(provider)
+
+def use_indonesian() -> bool:
+    """
+    Check if Indonesian language mode is enabled.
+    
+    Returns:
+        True if Indonesian language mode is enabled, False otherwise
+    """
+    return get_snapshot().use_indonesian
+
+def get_cot_in_english() -> bool:
+    """
+    Check if reasoning (Chain of Thought) should remain in English when using Indonesian responses.
+    
+    Returns:
+        True if CoT should remain in English, False if CoT should also be in Indonesian
+    """
+    return get_snapshot().cot_in_english
+
+# --- Resolvers (uncached; used to build the snapshot) ---
+
+def _resolve_openai_api_key() -> Optional[str]:
+    """Resolves the OpenAI API key from config sources."""
     # Checks ENV OPENAI_API_KEY first, then yaml openai.api_key
     key = get_config('OPENAI_API_KEY') or get_config('openai.api_key')
     return str(key) if key is not None else None
 
-def get_groq_api_key() -> Optional[str]:
-    """Convenience function to get the Groq API key."""
+def _resolve_groq_api_key() -> Optional[str]:
+    """Resolves the Groq API key from config sources."""
     # Checks ENV GROQ_API_KEY first, then yaml groq.api_key
     key = get_config('GROQ_API_KEY') or get_config('groq.api_key')
     return str(key) if key is not None else None
 
-def get_default_provider() -> str:
-    """Gets the default AI provider."""
+def _resolve_default_provider() -> str:
+    """Resolves the default AI provider from config sources."""
     provider = get_config('ai.default_provider', 'groq')
     return str(provider) if provider is not None else 'groq'
 
-def get_default_model(provider: Optional[str] = None) -> Optional[str]:
-    """Gets the default model for a given provider."""
-    selected_provider = provider or get_default_provider()
+def _resolve_default_model(provider: Optional[str] = None) -> Optional[str]:
+    """Resolves the default model for a given provider from config sources."""
+    selected_provider = provider or _resolve_default_provider()
     model = get_config(f'ai.{selected_provider}.default_model')
     # Return model as string if found, otherwise None
     return str(model) if model is not None else None
@@ -186,6 +426,7 @@ def set_config(key: str, value: Any) -> None:
         key: Configuration key (e.g., 'logging.level')
         value: Value to set
     """
+    ensure_loaded()  # a later lazy load would otherwise discard this value
     logger.debug(f"Setting config: {key} = {value}, type: {type(value)}")
     
     # Monitor specific settings related to Indonesian language support
@@ -204,63 +445,44 @@ def set_config(key: str, value: Any) -> None:
     
     # Store in memory
     _config[key] = value
+    _invalidate_config_caches()
     
     # Update environment variable
-    env_var = f"GOSCLI_{key.upper().replace('.', '_')}"
+    env_var = _goscli_env_cache.get(key)
+    if env_var is None:
+        env_var = f"GOSCLI_{key.upper().replace('.', '_')}"
+        env_var = _goscli_env_cache.setdefault(key, env_var)
     os.environ[env_var] = str(value)
     
     logger.debug(f"Config set: {key}={value}, environment variable: {env_var}={os.environ.get(env_var)}")
     
     # TODO: Optionally persist to a config file if "persistent" flag is set
 
-def use_indonesian() -> bool:
-    """
-    Check if Indonesian language mode is enabled.
-    
-    Returns:
-        True if Indonesian language mode is enabled, False otherwise
-    """
+def _to_bool(value: Any, default: bool, name: str) -> bool:
+    """Coerces a config flag to bool, accepting 'true'/'false' strings in any case."""
+    if isinstance(value, str):
+        flag = _BOOL_MAP.get(value.lower())
+        if flag is None:
+            logger.warning(
+                f"Unexpected string value for {name} flag: '{value}'. "
+                f"Defaulting to {default}."
+            )
+            return default
+        return flag
+    return bool(value)
+
+def _resolve_use_indonesian() -> bool:
+    """Resolves the Indonesian language flag from config sources."""
     flag = get_config('indonesian', False)
     logger.debug(f"Indonesian language setting checked: {flag}, type: {type(flag)}")
-    
-    # Handle string values like "True" or "False"
-    if isinstance(flag, str):
-        if flag.lower() == 'true':
-            return True
-        elif flag.lower() == 'false':
-            return False
-        else:
-            logger.warning(f"Unexpected string value for indonesian flag: '{flag}'. Defaulting to False.")
-            return False
-    
-    # Convert None to False (when the flag is passed without a value)
-    if flag is None:
-        logger.debug("Indonesian flag is None, treating as False")
-        return False
-            
-    return bool(flag)
+    # None (flag passed without a value) falls through bool() to False
+    return _to_bool(flag, False, 'indonesian')
 
-def get_cot_in_english() -> bool:
-    """
-    Check if reasoning (Chain of Thought) should remain in English when using Indonesian responses.
-    
-    Returns:
-        True if CoT should remain in English, False if CoT should also be in Indonesian
-    """
+def _resolve_cot_in_english() -> bool:
+    """Resolves the Chain of Thought in English flag from config sources."""
     flag = get_config('cot_in_english', True)
     logger.debug(f"CoT in English setting checked: {flag}, type: {type(flag)}")
-    
-    # Handle string values
-    if isinstance(flag, str):
-        if flag.lower() == 'true':
-            return True
-        elif flag.lower() == 'false':
-            return False
-        else:
-            logger.warning(f"Unexpected string value for cot_in_english flag: '{flag}'. Defaulting to True.")
-            return True
-            
-    return bool(flag)
+    return _to_bool(flag, True, 'cot_in_english')
 
 def set_config_for_testing(config_dict: Dict[str, Any]) -> None:
     """
@@ -271,14 +493,19 @@ def set_config_for_testing(config_dict: Dict[str, Any]) -> None:
         config_dict: Dictionary of configuration values to set
     """
     global _test_config
+    ensure_loaded()
     _test_config.update(config_dict)
+    _invalidate_config_caches()
     logger.debug(f"Set testing configuration: {config_dict}")
 
 def clear_test_config() -> None:
     """Clear all testing configuration values."""
     global _test_config
     _test_config = {}
+    _invalidate_config_caches()
     logger.debug("Cleared testing configuration")
 
-# Load configuration when the module is imported
-load_configuration() 
\ No newline at end of file
+def ensure_loaded() -> None:
+    """Loads configuration from the default locations if not loaded yet."""
+    if not _loaded:
+        load_configuration() 
\ No newline at end of file
@@ -7,6 +7,10 @@ Uses `pathlib` and `glob` for file operations and `aiofiles` for async I/O.
 import logging
 import glob
 import asyncio
+import fnmatch
+import functools
+import os
+import stat
 from pathlib import Path
 from typing import List
 
@@ -22,6 +26,47 @@ from goscli.domain.models.common import FilePath, PromptText
 
 logger = logging.getLogger(__name__)
 
+# Below this size a direct read/write beats the executor hop aiofiles makes
+_SMALL_FILE_BYTES = 64 * 1024
+
+@functools.lru_cache(maxsize=1024)
+def _to_path(path_str: str) -> Path:
+    """Returns a (shared, immutable) Path for a path string."""
+    return Path(path_str)
+
+@functools.lru_cache(maxsize=1024)
+def _parent_of(path_str: str) -> Path:
+    """Returns the parent directory Path for a path string."""
+    return _to_path(path_str).parent
+
+def _glob_files(pattern: str) -> List[str]:
+    """Returns regular files matching a glob pattern.
+
+    Patterns whose wildcards are confined to the final component are served by
+    a single `os.scandir` pass, taking the file type from the directory entry
+    instead of issuing a second `stat` per match. Anything else (`**`,
+    wildcards in directory components) goes through `glob.iglob`.
+    """
+    dirname, basename = os.path.split(pattern)
+    if '**' in pattern or glob.has_magic(dirname):
+        return [p for p in glob.iglob(pattern, recursive=True) if os.path.isfile(p)]
+    if not glob.has_magic(basename):
+        return [pattern] if os.path.isfile(pattern) else []
+
+    # Mirror glob: leading-dot names only match patterns that start with a dot
+    include_hidden = basename.startswith('.')
+    try:
+        with os.scandir(dirname or os.curdir) as it:
+            return [
+                os.path.join(dirname, entry.name) if dirname else entry.name
+                for entry in it
+                if (include_hidden or not entry.name.startswith('.'))
+                and fnmatch.fnmatch(entry.name, basename)
+                and entry.is_file()
+            ]
+    except OSError:
+        return []
+
 class LocalFileSystem(FileSystem):
     """Implementation of FileSystem for the local disk."""
 
@@ -33,18 +78,26 @@ class LocalFileSystem(FileSystem):
 
     async def read_file(self, file_path: FilePath) -> str:
         """Reads file content asynchronously using aiofiles if available."""
-        path = Path(file_path)
+        path = _to_path(str(file_path))
         logger.debug(f"Attempting to read file: {path}")
-        if not path.is_file():
+        try:
+            st = path.stat()
+        except OSError:
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
             raise FileNotFoundError(f"File not found: {file_path}")
 
         try:
-            if aiofiles:
-                async with aiofiles.open(path, mode='r', encoding='utf-8') as f:
-                    content = await f.read()
+            if st.st_size < _SMALL_FILE_BYTES:
+                data = path.read_bytes()
+            elif aiofiles:
+                async with aiofiles.open(path, mode='rb') as f:
+                    data = await f.read()
             else:
                 # Synchronous fallback
-                content = await asyncio.to_thread(path.read_text, encoding='utf-8')
+                data = await asyncio.to_thread(path.read_bytes)
+            # Decode the whole buffer once rather than through a text wrapper
+            content = data.decode('utf-8')
             logger.debug(f"Successfully read {len(content)} characters from {path}")
             return content
         except PermissionError as e:
@@ -56,17 +109,21 @@ class LocalFileSystem(FileSystem):
 
     async def write_file(self, file_path: FilePath, content: str) -> None:
         """Writes content to a file asynchronously using aiofiles if available."""
-        path = Path(file_path)
+        path = _to_path(str(file_path))
         logger.debug(f"Attempting to write {len(content)} characters to file: {path}")
         try:
             # Ensure parent directory exists
-            path.parent.mkdir(parents=True, exist_ok=True)
-            if aiofiles:
-                async with aiofiles.open(path, mode='w', encoding='utf-8') as f:
-                    await f.write(content)
+            _parent_of(str(file_path)).mkdir(parents=True, exist_ok=True)
+            # Encode once up front; the byte length also picks the write path
+            data = content.encode('utf-8')
+            if len(data) < _SMALL_FILE_BYTES:
+                path.write_bytes(data)
+            elif aiofiles:
+                async with aiofiles.open(path, mode='wb') as f:
+                    await f.write(data)
             else:
                 # Synchronous fallback
-                await asyncio.to_thread(path.write_text, content, encoding='utf-8')
+                await asyncio.to_thread(path.write_bytes, data)
             logger.debug(f"Successfully wrote to {path}")
         except PermissionError as e:
             logger.error(f"Permission denied writing file: {path}")
@@ -80,11 +137,10 @@ class LocalFileSystem(FileSystem):
         # Assumes query is a glob pattern
         logger.debug(f"Searching for files matching glob pattern: {query}")
         try:
-            # Run synchronous glob in a thread to avoid blocking event loop
-            # recursive=True enables `**` pattern
-            matched_paths = await asyncio.to_thread(glob.glob, query, recursive=True)
+            # Run the directory walk in a thread to avoid blocking event loop
+            matched_paths = await asyncio.to_thread(_glob_files, query)
             # Convert string paths to FilePath Value Objects
-            result = [FilePath(p) for p in matched_paths if Path(p).is_file()]
+            result = [FilePath(p) for p in matched_paths]
             logger.debug(f"Found {len(result)} files matching '{query}'")
             return result
         except Exception as e:
@@ -92,10 +148,14 @@ class LocalFileSystem(FileSystem):
             raise IOError(f"File search failed for query '{query}': {e}") from e
 
     async def file_exists(self, file_path: FilePath) -> bool:
-        """Checks if a file exists asynchronously."""
-        path = Path(file_path)
-        # Run synchronous check in thread
-        exists = await asyncio.to_thread(path.is_file)
+        """Checks if a file exists.
+
+        A single local `stat` is far cheaper than a thread-pool round trip, so
+        the check runs inline. On high-latency (network) filesystems,
+        `aiofiles.os.stat` would be the non-blocking alternative.
+        """
+        path = _to_path(str(file_path))
+        exists = path.is_file()
         logger.debug(f"Checked existence for {path}: {exists}")
         return exists
 
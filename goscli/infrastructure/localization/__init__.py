@@ -4,7 +4,10 @@ This package provides components for translating between languages
 and enhancing prompts/responses with language-specific features.
 """
 
-from goscli.infrastructure.localization.translation_service import TranslationService
+from goscli.infrastructure.localization.translation_service import (
+    TranslationService,
+    get_translation_service,
+)
 from goscli.infrastructure.localization.language_processor import LanguageProcessor
 
-__all__ = ['TranslationService', 'LanguageProcessor'] 
\ No newline at end of file
+__all__ = ['TranslationService', 'LanguageProcessor', 'get_translation_service'] 
\ No newline at end of file
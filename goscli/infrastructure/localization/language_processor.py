@@ -4,18 +4,35 @@ Handles preprocessing prompts and postprocessing responses to support
 different languages while maintaining quality of content.
 """
 
+import functools
 import logging
-import re
-from typing import Dict, List, Optional
-import copy
+from typing import Optional
 
-from goscli.domain.interfaces.ai_model import AIModel
-from goscli.domain.models.ai import ChatMessage, StructuredAIResponse
 from goscli.infrastructure.config.settings import use_indonesian, get_cot_in_english
-from goscli.infrastructure.localization.translation_service import TranslationService
+from goscli.infrastructure.localization.translation_service import (
+    get_translation_service,
+)
 
 logger = logging.getLogger(__name__)
 
+# Appended to system prompts when Indonesian mode is enabled
+_INDONESIAN_INSTRUCTION = (
+    "\n\nPenting: Berikan respons dalam Bahasa Indonesia yang baik dan benar. "
+    "Gunakan Bahasa Indonesia formal dan hindari pencampuran dengan Bahasa Inggris "
+    "kecuali untuk istilah teknis yang memang tidak ada padanannya dalam Bahasa Indonesia."
+)
+
+@functools.lru_cache(maxsize=32)
+def _enhance_cached(prompt: str) -> str:
+    """Returns `prompt` with the Indonesian instruction appended.
+
+    Cached because the same system prompts repeat throughout a session.
+    """
+    return prompt + _INDONESIAN_INSTRUCTION
+
+# Set once the Indonesian mode status has been logged for this process
+_logged_indonesian_status = False
+
 class LanguageProcessor:
     """Handles language-specific processing of prompts and responses."""
     
@@ -24,32 +41,40 @@ class LanguageProcessor:
         
         Args:
             translation_service: Optional TranslationService instance.
-                                 If not provided, one will be created.
+                                 If not provided, the shared instance is used.
         """
-        self.translation_service = translation_service or TranslationService()
+        self.translation_service = translation_service or get_translation_service()
         logger.info("LanguageProcessor initialized")
-        # Log whether Indonesian mode is enabled at initialization
-        self._log_indonesian_status()
     
-    def _log_indonesian_status(self):
-        """Log whether Indonesian mode is enabled."""
-        is_indonesian = use_indonesian()
+    def _log_indonesian_status(self, is_indonesian: bool) -> None:
+        """Log whether Indonesian mode is enabled, once per process."""
+        global _logged_indonesian_status
+        if _logged_indonesian_status:
+            return
+        _logged_indonesian_status = True
         if is_indonesian:
             logger.info("Indonesian language mode is ENABLED")
         else:
             logger.info("Indonesian language mode is DISABLED")
     
-    def enhance_system_prompt(self, prompt: str) -> str:
+    def enhance_system_prompt(
+        self, prompt: str, *, indonesian_enabled: Optional[bool] = None
+    ) -> str:
         """Enhance system prompt with Indonesian instructions if Indonesian is enabled.
         
         Args:
             prompt: The original system prompt
+            indonesian_enabled: Pre-resolved Indonesian mode flag. If None,
+                                the setting is looked up.
             
         Returns:
             Enhanced system prompt
         """
-        indonesian_enabled = use_indonesian()
-        logger.debug(f"[DEBUG LOG] Inside enhance_system_prompt: use_indonesian() returned: {indonesian_enabled}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if indonesian_enabled is None:
+            indonesian_enabled = use_indonesian()
+            if debug:
+                logger.debug(f"[DEBUG LOG] Inside enhance_system_prompt: use_indonesian() returned: {indonesian_enabled}")
         if not indonesian_enabled:
             logger.debug("Indonesian mode disabled - not enhancing system prompt")
             return prompt
@@ -57,14 +82,12 @@ class LanguageProcessor:
         logger.debug("Enhancing system prompt with Indonesian instructions")
         
         # Add instruction to respond in Indonesian at the end of the prompt
-        indonesian_instruction = (
-            "\n\nPenting: Berikan respons dalam Bahasa Indonesia yang baik dan benar. "
-            "Gunakan Bahasa Indonesia formal dan hindari pencampuran dengan Bahasa Inggris "
-            "kecuali untuk istilah teknis yang memang tidak ada padanannya dalam Bahasa Indonesia."
-        )
-        
-        enhanced_prompt = f"{prompt}{indonesian_instruction}"
-        logger.debug(f"Added {len(indonesian_instruction)} chars of Indonesian instructions to system prompt")
+        enhanced_prompt = _enhance_cached(prompt)
+        if debug:
+            logger.debug(
+                f"Added {len(_INDONESIAN_INSTRUCTION)} chars of Indonesian "
+                "instructions to system prompt"
+            )
         
         return enhanced_prompt
         
@@ -77,13 +100,22 @@ class LanguageProcessor:
         Returns:
             Preprocessed messages
         """
+        debug = logger.isEnabledFor(logging.DEBUG)
         if not messages:
             logger.debug("No messages to preprocess")
             return messages
             
-        logger.debug(f"Preprocessing {len(messages)} messages")
+        if debug:
+            logger.debug(f"Preprocessing {len(messages)} messages")
         indonesian_enabled = use_indonesian()
-        logger.debug(f"[DEBUG LOG] In preprocess_messages: use_indonesian() returned: {indonesian_enabled}")
+        self._log_indonesian_status(indonesian_enabled)
+        if debug:
+            logger.debug(f"[DEBUG LOG] In preprocess_messages: use_indonesian() returned: {indonesian_enabled}")
+        if not indonesian_enabled or not any(
+            isinstance(msg, dict) and msg.get("role") == "system" for msg in messages
+        ):
+            # Nothing to enhance; hand the caller's list back untouched
+            return messages
         
         processed = []
         for msg in messages:
@@ -92,20 +124,24 @@ class LanguageProcessor:
                 processed.append(msg)
                 continue
                 
-            # Make a copy to avoid modifying the original
-            processed_msg = msg.copy()
-            
-            # Enhance system messages with Indonesian instructions
-            if msg.get("role") == "system" and indonesian_enabled:
+            # Only system messages are rewritten, so only they need a copy
+            if msg.get("role") == "system":
                 logger.debug("Enhancing system message with Indonesian instructions")
-                processed_msg["content"] = self.enhance_system_prompt(msg.get("content", ""))
-                
-            processed.append(processed_msg)
+                processed_msg = msg.copy()
+                processed_msg["content"] = self.enhance_system_prompt(
+                    msg.get("content", ""), indonesian_enabled=indonesian_enabled
+                )
+                processed.append(processed_msg)
+            else:
+                processed.append(msg)
             
-        logger.debug(f"Preprocessing complete - {len(processed)} messages processed")
+        if debug:
+            logger.debug(
+                f"Preprocessing complete - {len(processed)} messages processed"
+            )
         return processed
         
-    def postprocess_response(self, response):
+    async def postprocess_response(self, response):
         """Postprocess AI response for language enhancements.
         
         Args:
@@ -114,12 +150,14 @@ class LanguageProcessor:
         Returns:
             Enhanced response
         """
+        debug = logger.isEnabledFor(logging.DEBUG)
         if response is None:
             logger.debug("Empty response, nothing to postprocess")
             return response
         
         # Debug log the type of response being processed    
-        logger.debug(f"Postprocessing response of type: {type(response)}")
+        if debug:
+            logger.debug(f"Postprocessing response of type: {type(response)}")
         
         # Handle StructuredAIResponse objects
         content = None
@@ -136,43 +174,73 @@ class LanguageProcessor:
             return response
             
         # Now log the content length safely
-        if isinstance(content, str):
-            logger.debug(f"Processing content of length {len(content)}")
-        else:
-            logger.debug(f"Content is not a string but of type: {type(content)}")
+        if debug:
+            if isinstance(content, str):
+                logger.debug(f"Processing content of length {len(content)}")
+            else:
+                logger.debug(f"Content is not a string but of type: {type(content)}")
             
         # Check if we need to translate
         use_indonesian_setting = use_indonesian()
-        logger.debug(f"[DEBUG LOG] In postprocess_response: use_indonesian() returned: {use_indonesian_setting}")
+        if debug:
+            logger.debug(f"[DEBUG LOG] In postprocess_response: use_indonesian() returned: {use_indonesian_setting}")
         
         if use_indonesian_setting and self.translation_service:
-            try:
-                logger.debug(f"[DEBUG LOG] About to translate response to Indonesian, response type: {type(response)}")
-                preserve_english_reasoning = get_cot_in_english()
-                logger.debug(f"Preserving English reasoning: {preserve_english_reasoning}")
+            return await self._translate_response(response, content, debug)
+        elif debug:
+            logger.debug(
+                "[DEBUG LOG] Skipping translation: "
+                f"use_indonesian={use_indonesian_setting}, "
+                f"has_translation_service={self.translation_service is not None}"
+            )
                 
-                # Translate content to Indonesian if it's a string
-                if isinstance(content, str):
-                    translated_content = self.translation_service.translate_to_indonesian(
-                        content,
-                        preserve_english_reasoning=preserve_english_reasoning
-                    )
-                    logger.debug(f"[DEBUG LOG] Translation completed. Original length: {len(content)}, Translated length: {len(translated_content)}")
-                    
-                    # If original was a structured response, update its content
-                    if hasattr(response, 'content'):
-                        logger.debug("Updating structured response content with translation")
-                        response.content = translated_content
-                        return response
-                    else:
-                        # Otherwise return the translated content directly
-                        return translated_content
-                else:
-                    logger.warning(f"Cannot translate non-string content of type: {type(content)}")
-            except Exception as e:
-                logger.error(f"Translation error during postprocessing: {e}")
-                logger.warning("Using original response due to translation failure")
-        else:
-            logger.debug(f"[DEBUG LOG] Skipping translation: use_indonesian={use_indonesian_setting}, has_translation_service={self.translation_service is not None}")
-                
-        return response 
\ No newline at end of file
+        return response
+
+    async def _translate_response(self, response, content, debug: bool):
+        """Translate postprocessed content to Indonesian.
+
+        Args:
+            response: The AI response (could be string or StructuredAIResponse)
+            content: The response's content
+            debug: Whether debug logging is enabled
+
+        Returns:
+            The translated response, or the original one if translation fails
+        """
+        try:
+            if debug:
+                logger.debug(
+                    "[DEBUG LOG] About to translate response to Indonesian, "
+                    f"response type: {type(response)}"
+                )
+            preserve_english_reasoning = get_cot_in_english()
+            if debug:
+                logger.debug(f"Preserving English reasoning: {preserve_english_reasoning}")
+            
+            # Translate content to Indonesian if it's a string
+            if not isinstance(content, str):
+                logger.warning(f"Cannot translate non-string content of type: {type(content)}")
+                return response
+            service = self.translation_service
+            translated_content = await service.translate_to_indonesian_async(
+                content,
+                preserve_english_reasoning=preserve_english_reasoning
+            )
+            if debug:
+                logger.debug(
+                    "[DEBUG LOG] Translation completed. "
+                    f"Original length: {len(content)}, "
+                    f"Translated length: {len(translated_content)}"
+                )
+            
+            # If original was a structured response, update its content
+            if hasattr(response, 'content'):
+                logger.debug("Updating structured response content with translation")
+                response.content = translated_content
+                return response
+            # Otherwise return the translated content directly
+            return translated_content
+        except Exception as e:
+            logger.error(f"Translation error during postprocessing: {e}")
+            logger.warning("Using original response due to translation failure")
+            return response
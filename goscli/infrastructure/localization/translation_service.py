@@ -4,9 +4,19 @@ Provides translation capabilities for the application, with a focus on
 English reasoning with Indonesian final answers.
 """
 
+import asyncio
+import hashlib
 import logging
 import re
-from typing import Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # Optional: fallback phrases are then matched by regex
 
 # Import AIModel interface to call translation directly when needed
 from goscli.domain.interfaces.ai_model import AIModel
@@ -15,6 +25,159 @@ from goscli.infrastructure.config.settings import use_indonesian, get_cot_in_eng
 
 logger = logging.getLogger(__name__)
 
+# In-process translation cache settings; bump the version to invalidate keys
+_TRANSLATION_CACHE_MAX_ITEMS = 2048
+_TRANSLATION_CACHE_VERSION = "v1"
+
+# Phrases that open a conclusion section
+_CONCLUSION_MARKERS = (
+    "Therefore,",
+    "In conclusion,",
+    "In summary,",
+    "To summarize,",
+    "The answer is",
+    "The solution is",
+    "Finally,",
+    "So,",
+    "Overall,",
+    "Thus,",
+)
+
+# Lowercased markers for the line scanner below
+_CONCLUSION_STARTS = tuple(m.lower() for m in _CONCLUSION_MARKERS)
+
+def _find_conclusion_span(text: str) -> Optional[Tuple[int, int]]:
+    """Returns the (start, end) span of the conclusion section, if any.
+
+    The conclusion starts at the first line that opens with a conclusion
+    marker and runs to the end of the text (excluding one trailing newline).
+    A single linear pass over the lines replaces the DOTALL regex search.
+    """
+    offset = 0
+    for line in text.splitlines(keepends=True):
+        stripped = line.lstrip()
+        if stripped.lower().startswith(_CONCLUSION_STARTS):
+            start = offset + len(line) - len(stripped)
+            end = len(text) - 1 if text.endswith("\n") else len(text)
+            return start, end
+        offset += len(line)
+    return None
+
+# Simple dictionary-based translation for common phrases
+# This is very limited but better than nothing as a fallback
+_FALLBACK_TRANSLATIONS = {
+    # Common English phrases
+    "The answer is": "Jawabannya adalah",
+    "Therefore": "Oleh karena itu",
+    "In conclusion": "Kesimpulannya",
+    "To summarize": "Untuk meringkas",
+    "Finally": "Akhirnya",
+    "In summary": "Ringkasnya",
+    "Hence": "Karena itu",
+    "Thus": "Dengan demikian",
+    "To conclude": "Untuk menyimpulkan",
+    "In the end": "Pada akhirnya",
+    "Ultimately": "Pada akhirnya",
+    "I believe": "Saya percaya",
+    "The solution is": "Solusinya adalah",
+
+    # Programming related terms
+    "Python": "Python",
+    "programming language": "bahasa pemrograman",
+    "code": "kode",
+    "function": "fungsi",
+    "class": "kelas",
+    "method": "metode",
+    "variable": "variabel",
+    "loop": "perulangan",
+    "if statement": "pernyataan if",
+    "condition": "kondisi",
+    "file": "berkas",
+    "directory": "direktori",
+    "module": "modul",
+    "package": "paket",
+    "import": "impor",
+    "error": "kesalahan",
+    "exception": "pengecualian",
+    "debug": "debug",
+    "compile": "kompilasi",
+    "runtime": "runtime",
+    "syntax": "sintaks",
+
+    # Yes/No and basic responses
+    "Yes": "Ya",
+    "No": "Tidak",
+    "Maybe": "Mungkin",
+    "I don't know": "Saya tidak tahu",
+    "Hello": "Halo",
+    "Thank you": "Terima kasih",
+    "Please": "Silakan",
+    "Sorry": "Maaf",
+    "Good": "Baik",
+    "Bad": "Buruk",
+}
+
+# Entries that translate to themselves ("Python", "debug", ...) would only be
+# matched to be written back unchanged, so they are left out of the matchers
+_FALLBACK_REPLACEMENTS = {
+    eng: ind for eng, ind in _FALLBACK_TRANSLATIONS.items() if eng != ind
+}
+
+# One case-insensitive alternation over all fallback phrases, longest first so
+# multi-word phrases win over their prefixes; replacements are looked up by
+# the lowercased match
+_FALLBACK_RE = re.compile(
+    "|".join(
+        re.escape(eng)
+        for eng in sorted(_FALLBACK_REPLACEMENTS, key=len, reverse=True)
+    ),
+    re.IGNORECASE,
+)
+_FALLBACK_LOOKUP = {eng.lower(): ind for eng, ind in _FALLBACK_REPLACEMENTS.items()}
+
+def _build_fallback_automaton():
+    """Builds an Aho-Corasick automaton over the lowercased fallback phrases."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for eng, ind in _FALLBACK_REPLACEMENTS.items():
+        automaton.add_word(eng.lower(), (len(eng), ind))
+    automaton.make_automaton()
+    return automaton
+
+_FALLBACK_AUTOMATON = _build_fallback_automaton()
+
+def _replace_fallback_phrases(text: str) -> str:
+    """Replaces fallback phrases case-insensitively, leftmost-longest first.
+
+    Uses the Aho-Corasick automaton when pyahocorasick is installed and falls
+    back to the alternation regex otherwise (or when lowercasing changes the
+    text length, which would misalign match offsets).
+    """
+    lowered = text.lower()
+    if _FALLBACK_AUTOMATON is None or len(lowered) != len(text):
+        return _FALLBACK_RE.sub(lambda m: _FALLBACK_LOOKUP[m.group(0).lower()], text)
+
+    # Longest phrase per start offset, then a left-to-right non-overlapping pick
+    longest = {}
+    for end, (length, ind) in _FALLBACK_AUTOMATON.iter(lowered):
+        start = end - length + 1
+        best = longest.get(start)
+        if best is None or length > best[0]:
+            longest[start] = (length, ind)
+
+    parts = []
+    pos = 0
+    for start in sorted(longest):
+        if start < pos:
+            continue
+        length, ind = longest[start]
+        parts.append(text[pos:start])
+        parts.append(ind)
+        pos = start + length
+    parts.append(text[pos:])
+    return "".join(parts)
+
 class TranslationService:
     """Service for translating text between languages, focusing on English -> Indonesian."""
     
@@ -25,6 +188,12 @@ class TranslationService:
             ai_model: Optional AI model to use for translations when direct API access is preferred
         """
         self.ai_model = ai_model
+        # LRU of AI translations keyed by a digest of the source text
+        self._translation_cache: "OrderedDict[str, str]" = OrderedDict()
+        # Translations may run in worker threads (asyncio.to_thread)
+        self._cache_lock = threading.Lock()
+        # Cache key -> Future of the AI call currently translating that text
+        self._inflight: Dict[str, Future] = {}
         logger.info("TranslationService initialized")
         self._log_indonesian_status()
     
@@ -48,6 +217,7 @@ class TranslationService:
         Returns:
             Translated Indonesian text
         """
+        debug = logger.isEnabledFor(logging.DEBUG)
         # Check for empty text
         if not text or not text.strip():
             logger.debug("Nothing to translate - text is empty")
@@ -55,12 +225,14 @@ class TranslationService:
             
         # Skip translation if Indonesian is disabled (safety check)
         indonesian_enabled = use_indonesian()
-        logger.debug(f"[DEBUG LOG] In translate_to_indonesian: use_indonesian() returned: {indonesian_enabled}")
+        if debug:
+            logger.debug(f"[DEBUG LOG] In translate_to_indonesian: use_indonesian() returned: {indonesian_enabled}")
         if not indonesian_enabled:
             logger.debug("Indonesian mode is disabled - skipping translation")
             return text
             
-        logger.debug(f"Translating text to Indonesian (length: {len(text)}, preserve_english_reasoning: {preserve_english_reasoning})")
+        if debug:
+            logger.debug(f"Translating text to Indonesian (length: {len(text)}, preserve_english_reasoning: {preserve_english_reasoning})")
         
         try:
             if preserve_english_reasoning:
@@ -74,6 +246,29 @@ class TranslationService:
             logger.warning("Returning original text due to translation failure")
             return text
     
+    async def translate_to_indonesian_async(
+        self, text: str, preserve_english_reasoning: bool = False
+    ) -> str:
+        """Async variant of `translate_to_indonesian`.
+
+        The translation path calls the AI model synchronously, so it runs in a
+        worker thread to keep the event loop responsive.
+
+        Args:
+            text: The English text to translate
+            preserve_english_reasoning: If True, will keep reasoning/thought
+                                         process in English and only translate
+                                         the conclusion/answer
+
+        Returns:
+            Translated Indonesian text
+        """
+        return await asyncio.to_thread(
+            self.translate_to_indonesian,
+            text,
+            preserve_english_reasoning=preserve_english_reasoning,
+        )
+
     def _translate_full_text(self, text: str) -> str:
         """Translates the entire text to Indonesian.
         
@@ -83,43 +278,97 @@ class TranslationService:
         Returns:
             Translated Indonesian text
         """
+        debug = logger.isEnabledFor(logging.DEBUG)
         logger.debug("Starting full text translation")
         
         # Use AI model if available
         if self.ai_model:
-            try:
-                logger.debug("Using AI model for translation")
-                
-                # Prepare the translation prompt
-                system_prompt = (
-                    "You are a professional English to Indonesian translator. Translate the given text to natural, "
-                    "fluent Indonesian while preserving technical terms when appropriate. Ensure the translation "
-                    "sounds natural and maintains the original meaning. DO NOT add any explanations or extra text - "
-                    "simply return the translated text."
-                )
-                
-                messages = [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Translate the following to Indonesian:\n\n{text}"}
-                ]
-                
-                # Get the translation from the AI model
-                logger.debug(f"[DEBUG LOG] Sending translation request using AI model of type: {type(self.ai_model)}")
-                response = self.ai_model.generate_content(messages)
-                translated_text = response.content
-                
-                logger.debug(f"AI translation complete. Original: {len(text)} chars, Translated: {len(translated_text)} chars")
-                logger.debug(f"[DEBUG LOG] First 100 chars of translated text: {translated_text[:100] if translated_text and len(translated_text) > 0 else 'EMPTY'}")
-                return translated_text
-            except Exception as e:
-                logger.error(f"AI translation failed: {e}")
-                logger.debug("Falling back to direct translation")
+            cache_key = self._translation_cache_key(text)
+            leader = False
+            with self._cache_lock:
+                cached = self._translation_cache.get(cache_key)
+                if cached is not None:
+                    self._translation_cache.move_to_end(cache_key)
+                else:
+                    # Coalesce identical concurrent requests onto one AI call
+                    pending = self._inflight.get(cache_key)
+                    if pending is None:
+                        pending = self._inflight[cache_key] = Future()
+                        leader = True
+            if cached is not None:
+                logger.debug("Translation cache hit")
+                return cached
+
+            if not leader:
+                logger.debug("Waiting for identical in-flight translation")
+                translated_text = pending.result()
+                if translated_text is not None:
+                    return translated_text
+            else:
+                try:
+                    translated_text = self._request_ai_translation(text, debug)
+                    if translated_text:
+                        self._remember_translation(cache_key, translated_text)
+                    pending.set_result(translated_text)
+                    return translated_text
+                except Exception as e:
+                    logger.error(f"AI translation failed: {e}")
+                    logger.debug("Falling back to direct translation")
+                finally:
+                    with self._cache_lock:
+                        self._inflight.pop(cache_key, None)
+                    # Release waiters on any failure, including BaseExceptions
+                    # such as KeyboardInterrupt; None sends them to the fallback
+                    if not pending.done():
+                        pending.set_result(None)
         else:
             logger.debug("[DEBUG LOG] No AI model available for translation, using fallback translation")
             
         # Fallback to direct translation for common phrases
         return self._fallback_direct_translation(text)
     
+    def _request_ai_translation(self, text: str, debug: bool) -> str:
+        """Asks the AI model for a full Indonesian translation of `text`."""
+        logger.debug("Using AI model for translation")
+        
+        # Prepare the translation prompt
+        system_prompt = (
+            "You are a professional English to Indonesian translator. Translate the given text to natural, "
+            "fluent Indonesian while preserving technical terms when appropriate. Ensure the translation "
+            "sounds natural and maintains the original meaning. DO NOT add any explanations or extra text - "
+            "simply return the translated text."
+        )
+        
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"Translate the following to Indonesian:\n\n{text}"}
+        ]
+        
+        # Get the translation from the AI model
+        if debug:
+            logger.debug(f"[DEBUG LOG] Sending translation request using AI model of type: {type(self.ai_model)}")
+        response = self.ai_model.generate_content(messages)
+        translated_text = response.content
+        
+        if debug:
+            logger.debug(f"AI translation complete. Original: {len(text)} chars, Translated: {len(translated_text)} chars")
+            logger.debug(f"[DEBUG LOG] First 100 chars of translated text: {translated_text[:100] if translated_text and len(translated_text) > 0 else 'EMPTY'}")
+        return translated_text
+
+    @staticmethod
+    def _translation_cache_key(text: str) -> str:
+        """Builds a compact, versioned cache key for a source text."""
+        digest = hashlib.md5(text.encode('utf-8'), usedforsecurity=False).hexdigest()
+        return f"{_TRANSLATION_CACHE_VERSION}:{digest}"
+
+    def _remember_translation(self, cache_key: str, translated_text: str) -> None:
+        """Stores a translation, evicting the least recently used entry when full."""
+        with self._cache_lock:
+            self._translation_cache[cache_key] = translated_text
+            self._translation_cache.move_to_end(cache_key)
+            if len(self._translation_cache) > _TRANSLATION_CACHE_MAX_ITEMS:
+                self._translation_cache.popitem(last=False)
+
     def _translate_with_cot_preservation(self, text: str) -> str:
         """Preserves English reasoning but translates the conclusion to Indonesian.
         
@@ -132,41 +381,32 @@ class TranslationService:
         Returns:
             Text with English reasoning but Indonesian conclusion/answer
         """
+        debug = logger.isEnabledFor(logging.DEBUG)
         logger.debug("Starting translation with English reasoning preservation")
         
-        # Patterns to identify conclusion sections
-        conclusion_patterns = [
-            r"(Therefore,.*?)$",
-            r"(In conclusion,.*?)$",
-            r"(In summary,.*?)$",
-            r"(To summarize,.*?)$", 
-            r"(The answer is.*?)$",
-            r"(The solution is.*?)$",
-            r"(Finally,.*?)$",
-            r"(So,.*?)$",
-            r"(Overall,.*?)$",
-            r"(Thus,.*?)$"
-        ]
-        
         # Try to find a conclusion section
         conclusion_text = None
-        conclusion_marker = None
         
-        for pattern in conclusion_patterns:
-            match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-            if match:
-                conclusion_text = match.group(1)
-                conclusion_marker = match.group(0)[:20] + "..." if len(match.group(0)) > 23 else match.group(0)
+        conclusion_span = _find_conclusion_span(text)
+        if conclusion_span:
+            conclusion_text = text[conclusion_span[0]:conclusion_span[1]]
+            if debug:
+                conclusion_marker = conclusion_text
+                if len(conclusion_text) > 23:
+                    conclusion_marker = conclusion_text[:20] + "..."
                 logger.debug(f"Found conclusion marker: '{conclusion_marker}'")
                 logger.debug(f"Conclusion text length: {len(conclusion_text)} chars")
-                break
                 
         if not conclusion_text:
             logger.debug("No conclusion section found, translating last paragraph instead")
-            # If no conclusion pattern is found, use the last paragraph as the conclusion
-            paragraphs = text.split("\n\n")
-            conclusion_text = paragraphs[-1] if paragraphs else text
-            logger.debug(f"Using last paragraph as conclusion (length: {len(conclusion_text)} chars)")
+            # If no conclusion pattern is found, use the last paragraph as the
+            # conclusion; it starts right after the last blank-line separator
+            separator = text.rfind("\n\n")
+            paragraph_start = separator + 2 if separator != -1 else 0
+            conclusion_span = (paragraph_start, len(text))
+            conclusion_text = text[paragraph_start:]
+            if debug:
+                logger.debug(f"Using last paragraph as conclusion (length: {len(conclusion_text)} chars)")
             
         # Skip if conclusion is too short (likely not a real conclusion)
         if len(conclusion_text) < 10:
@@ -178,14 +418,12 @@ class TranslationService:
             logger.debug("Translating conclusion to Indonesian")
             translated_conclusion = self._translate_full_text(conclusion_text)
             
-            # Replace the original conclusion with the translated one
-            if conclusion_marker:
-                logger.debug("Replacing original conclusion with translated version")
-                return text.replace(conclusion_text, translated_conclusion)
-            else:
-                logger.debug("Replacing last paragraph with translated version")
-                result = text.replace(conclusion_text, translated_conclusion)
-                return result
+            # Replace the original conclusion with the translated one. Splice at
+            # the conclusion span: one rebuild, and an identical sentence earlier
+            # in the reasoning is left untouched
+            logger.debug("Replacing original conclusion with translated version")
+            start, end = conclusion_span
+            return "".join((text[:start], translated_conclusion, text[end:]))
         except Exception as e:
             logger.error(f"Error during partial translation: {e}")
             logger.warning("Falling back to full text translation")
@@ -223,7 +461,8 @@ class TranslationService:
             response = await self.ai_model.send_messages(messages)
             
             if response and response.content:
-                logger.debug(f"Received translation response. Length: {len(response.content)}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Received translation response. Length: {len(response.content)}")
                 return response.content
             else:
                 logger.warning("Empty response from AI model")
@@ -240,68 +479,11 @@ class TranslationService:
         indicates that a fallback was used.
         """
         logger.warning("Using fallback translation method")
-        logger.debug(f"[DEBUG LOG] Fallback translation for text of length: {len(text)}")
-        
-        # Simple dictionary-based translation for common phrases
-        # This is very limited but better than nothing as a fallback
-        translation_dict = {
-            # Common English phrases
-            "The answer is": "Jawabannya adalah",
-            "Therefore": "Oleh karena itu",
-            "In conclusion": "Kesimpulannya",
-            "To summarize": "Untuk meringkas",
-            "Finally": "Akhirnya",
-            "In summary": "Ringkasnya",
-            "Hence": "Karena itu",
-            "Thus": "Dengan demikian",
-            "To conclude": "Untuk menyimpulkan",
-            "In the end": "Pada akhirnya",
-            "Ultimately": "Pada akhirnya",
-            "I believe": "Saya percaya",
-            "The solution is": "Solusinya adalah",
-            
-            # Programming related terms
-            "Python": "Python",
-            "programming language": "bahasa pemrograman",
-            "code": "kode",
-            "function": "fungsi",
-            "class": "kelas",
-            "method": "metode",
-            "variable": "variabel",
-            "loop": "perulangan",
-            "if statement": "pernyataan if",
-            "condition": "kondisi",
-            "file": "berkas",
-            "directory": "direktori",
-            "module": "modul",
-            "package": "paket",
-            "import": "impor",
-            "error": "kesalahan",
-            "exception": "pengecualian",
-            "debug": "debug",
-            "compile": "kompilasi",
-            "runtime": "runtime",
-            "syntax": "sintaks",
-            
-            # Yes/No and basic responses
-            "Yes": "Ya",
-            "No": "Tidak",
-            "Maybe": "Mungkin",
-            "I don't know": "Saya tidak tahu",
-            "Hello": "Halo",
-            "Thank you": "Terima kasih",
-            "Please": "Silakan",
-            "Sorry": "Maaf",
-            "Good": "Baik",
-            "Bad": "Buruk",
-        }
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"[DEBUG LOG] Fallback translation for text of length: {len(text)}")
         
-        # Apply simple translations
-        translated = text
-        for eng, ind in translation_dict.items():
-            # Case-insensitive replacement preserving the case pattern where possible
-            pattern = re.compile(re.escape(eng), re.IGNORECASE)
-            translated = pattern.sub(ind, translated)
+        # Apply simple translations in a single scan of the text
+        translated = _replace_fallback_phrases(text)
         
         # Add note about fallback translation
         return f"[Terjemahan sederhana - fallback mode]\n\n{translated}"
@@ -313,4 +495,24 @@ class TranslationService:
             "Jika memberikan penjelasan (Chain of Thought), berikan penjelasan "
             "dalam bahasa Inggris, tetapi kesimpulan/jawaban akhir HARUS dalam bahasa Indonesia. "
             "Ini merupakan persyaratan penting - semua kesimpulan HARUS dalam bahasa Indonesia."
-        ) 
\ No newline at end of file
+        )
+
+_shared_service: Optional[TranslationService] = None
+_shared_service_lock = threading.Lock()
+
+def get_translation_service(ai_model: Optional[AIModel] = None) -> TranslationService:
+    """Returns the process-wide TranslationService, creating it on first use.
+
+    Sharing one instance keeps its translation cache warm across callers. An
+    `ai_model` passed later is attached if the shared instance has none yet.
+
+    Args:
+        ai_model: Optional AI model to use for translations.
+    """
+    global _shared_service
+    with _shared_service_lock:
+        if _shared_service is None:
+            _shared_service = TranslationService(ai_model=ai_model)
+        elif ai_model is not None and _shared_service.ai_model is None:
+            _shared_service.ai_model = ai_model
+        return _shared_service
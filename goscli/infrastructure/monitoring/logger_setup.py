@@ -4,7 +4,10 @@ Sets up standard Python logging with appropriate levels, formatters,
 and handlers (e.g., console, file).
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from typing import Optional
 
@@ -12,6 +15,22 @@ from typing import Optional
 DEFAULT_LOG_LEVEL = logging.INFO
 DEFAULT_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 DEFAULT_LOG_FILE = None # Or e.g., Path.home() / ".goscli_cache" / "goscli.log"
+DEFAULT_LOG_FILE_MAX_BYTES = 10 * 1024 * 1024  # Rotate log files at 10 MiB
+DEFAULT_LOG_FILE_BACKUP_COUNT = 5
+
+# Background listener that performs the actual handler I/O
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def _stop_listener() -> None:
+    """Flushes queued records and stops the background listener, if running."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+atexit.register(_stop_listener)
 
 def setup_logging(
     log_level: int = DEFAULT_LOG_LEVEL,
@@ -20,6 +39,10 @@ def setup_logging(
 ) -> None:
     """Configures the root logger for the application.
 
+    Log calls only enqueue the record; a background QueueListener writes it to
+    the console and (optionally) a size-rotated log file, so handler I/O stays
+    off the calling thread.
+
     Args:
         log_level: The minimum logging level (e.g., logging.DEBUG, logging.INFO).
         log_format: The format string for log messages.
@@ -30,6 +53,7 @@ def setup_logging(
     root_logger.setLevel(log_level)
 
     # Remove existing handlers attached to the root logger
+    _stop_listener()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
 
@@ -40,20 +64,41 @@ def setup_logging(
     console_handler = logging.StreamHandler(sys.stdout) # Use stdout for console
     console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    handlers = [console_handler]
 
     # Create File Handler (Optional)
+    file_error = None
     if log_file:
         try:
-            # TODO: Add file rotation (e.g., RotatingFileHandler)
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file,
+                maxBytes=DEFAULT_LOG_FILE_MAX_BYTES,
+                backupCount=DEFAULT_LOG_FILE_BACKUP_COUNT,
+                encoding='utf-8',
+            )
             file_handler.setLevel(log_level)
             file_handler.setFormatter(formatter)
-            root_logger.addHandler(file_handler)
-            logging.info(f"Logging to file: {log_file}")
+            handlers.append(file_handler)
         except Exception as e:
-            logging.error(f"Failed to set up file logging to {log_file}: {e}", exc_info=True)
-    
+            file_error = e
+
+    # Producers only enqueue; the listener thread does the writes
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    global _listener
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+
+    if file_error is not None:
+        logging.error(
+            f"Failed to set up file logging to {log_file}: {file_error}",
+            exc_info=file_error,
+        )
+    elif log_file:
+        logging.info(f"Logging to file: {log_file}")
+
     logging.info(f"Logging configured. Level={logging.getLevelName(log_level)}")
 
 # Example of how to call this early in the application (e.g., in main.py)
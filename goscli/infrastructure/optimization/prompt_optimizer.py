@@ -6,6 +6,8 @@ the context window of an AI model minus a buffer for the response.
 Bounded Context: Prompt Optimization
 """
 
+import bisect
+import itertools
 import logging
 from typing import List, Optional
 
@@ -19,6 +21,21 @@ from goscli.infrastructure.optimization.token_estimator import TokenEstimator
 
 logger = logging.getLogger(__name__)
 
+def _token_upper_bound(messages: List[ChatMessage]) -> int:
+    """Cheap upper bound on any estimate TokenEstimator gives for `messages`.
+
+    Every BPE token covers at least one UTF-8 byte, so the byte length of the
+    message fields bounds the tiktoken count; it also bounds the character
+    approximation. Per-message overhead is bounded by 5 plus 2 for priming.
+    """
+    total = 2
+    for message in messages:
+        total += 5
+        for value in message.values():
+            text = value if isinstance(value, str) else str(value)
+            total += len(text) if text.isascii() else len(text.encode('utf-8'))
+    return total
+
 class PromptOptimizer:
     """Optimizes message lists to fit within token limits."""
 
@@ -49,39 +66,104 @@ class PromptOptimizer:
             max_tokens: The target maximum token count.
 
         Returns:
-            An optimized list of ChatMessage dictionaries.
+            An optimized list of ChatMessage dictionaries. If no optimization
+            is needed this is `messages` itself, so callers must not mutate it.
             Returns an empty list if optimization fails (e.g., target too small).
         """
-        # Create a copy to avoid modifying the original list directly
-        current_messages = messages[:]
+        # Never mutated below; truncated results are built from slices, so no
+        # copy is made on the common already-within-limit path
+        current_messages = messages
+        # Short conversations provably fit without running the tokenizer
+        if _token_upper_bound(current_messages) <= max_tokens:
+            logger.debug("No optimization needed, message size bound within limit.")
+            return current_messages
+
         current_tokens = self.token_estimator.estimate_tokens_for_messages(current_messages)
         logger.debug(f"Optimizing messages: Start tokens={current_tokens}, Target max={max_tokens}")
 
         if current_tokens <= max_tokens:
             logger.debug("No optimization needed, current tokens within limit.")
-            return current_messages # Return the copy
+            return current_messages
+
+        # A lone message that does not fit cannot be truncated any further
+        # (dropping it, or keeping it as the only system prompt, both fail)
+        if len(current_messages) == 1:
+            logger.error(
+                f"Cannot optimize messages to meet max_tokens={max_tokens}. "
+                f"Single message needs {current_tokens} tokens."
+            )
+            return []
 
+        return self._truncate_oldest(current_messages, max_tokens)
+
+    def _truncate_oldest(
+        self, current_messages: List[ChatMessage], max_tokens: TokenCount
+    ) -> List[ChatMessage]:
+        """Drops the oldest non-system messages until the list fits max_tokens.
+
+        Returns:
+            The truncated list, or an empty list if even the system prompt
+            alone does not fit.
+        """
         # --- Simple Truncation Strategy --- 
         system_prompt: Optional[ChatMessage] = None
 
         # Preserve system prompt if it exists at the beginning
         if current_messages and current_messages[0].get('role') == 'system':
-            system_prompt = current_messages.pop(0)
+            system_prompt = current_messages[0]
+            current_messages = current_messages[1:]
             logger.debug("Preserving system prompt during optimization.")
 
-        # Repeatedly remove the oldest message (index 0 of remaining list) until limit is met
-        while current_messages:
-            # List to check includes system prompt if it exists
-            list_to_check = ([system_prompt] + current_messages) if system_prompt else current_messages
-            current_tokens = self.token_estimator.estimate_tokens_for_messages(list_to_check)
-
-            if current_tokens <= max_tokens:
-                logger.info(f"Optimization complete via truncation. Final tokens: {current_tokens}")
-                return list_to_check
-            else:
-                # Remove the oldest message (at index 0 of the *mutable* list)
-                removed_message = current_messages.pop(0)
-                logger.debug(f"Removed message ({removed_message.get('role')}) to reduce tokens. New count (estimated): {current_tokens}")
+        # Estimate each message once and keep a running total while truncating,
+        # instead of re-estimating the whole remaining list after every removal
+        estimator = self.token_estimator
+        per_message_tokens = [
+            estimator.estimate_tokens_for_message(m) for m in current_messages
+        ]
+        running_tokens = (
+            estimator.estimate_tokens_for_messages([]) + sum(per_message_tokens)
+        )
+        if system_prompt:
+            running_tokens += estimator.estimate_tokens_for_message(system_prompt)
+
+        # Jump straight to the first cutoff whose running total fits: removed[h]
+        # is the tokens saved by dropping the oldest h messages (non-decreasing)
+        removed = list(itertools.accumulate(per_message_tokens, initial=0))
+        head = min(
+            bisect.bisect_left(removed, running_tokens - max_tokens),
+            len(current_messages),
+        )
+        running_tokens -= removed[head]
+        if head:
+            logger.debug(
+                f"Removed {head} oldest message(s) to reduce tokens. "
+                f"New count (estimated): {running_tokens}"
+            )
+
+        # From there, advance a head index over the remaining messages (only
+        # needed if the full-estimate safety check still disagrees)
+        while head < len(current_messages):
+            if running_tokens <= max_tokens:
+                # List to check includes system prompt if it exists
+                remaining = current_messages[head:]
+                list_to_check = (
+                    ([system_prompt] + remaining) if system_prompt else remaining
+                )
+                # Safety check with a full estimate (approximations can round
+                # differently)
+                current_tokens = estimator.estimate_tokens_for_messages(list_to_check)
+                if current_tokens <= max_tokens:
+                    logger.info(f"Optimization complete via truncation. Final tokens: {current_tokens}")
+                    return list_to_check
+
+            # Drop the oldest remaining message
+            removed_message = current_messages[head]
+            running_tokens -= per_message_tokens[head]
+            head += 1
+            logger.debug(
+                f"Removed message ({removed_message.get('role')}) to reduce tokens. "
+                f"New count (estimated): {running_tokens}"
+            )
 
         # If the loop finishes, only the system prompt might remain
         if system_prompt:
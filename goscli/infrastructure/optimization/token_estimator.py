@@ -5,8 +5,10 @@ before sending requests to AI models, helping to prevent exceeding context limit
 Bounded Context: Token Management
 """
 
+import functools
 import logging
-from typing import List, Optional
+import os
+from typing import Dict, List, Optional
 
 try:
     import tiktoken
@@ -24,6 +26,20 @@ logger = logging.getLogger(__name__)
 # TODO: Make this configurable based on the target AI model
 DEFAULT_TOKENIZER_MODEL = "cl100k_base" # Common for GPT-3.5/4
 APPROX_CHARS_PER_TOKEN = 4 # Fallback approximation
+# Longer strings are encoded directly rather than kept alive in the count cache
+_MAX_CACHED_TEXT_CHARS = 16 * 1024
+# Role values and other tiny fields counted on almost every message
+_COMMON_SHORT_STRINGS = (" ", "user", "assistant", "system", "tool", "function")
+
+@functools.lru_cache(maxsize=8)
+def _get_encoding(name: str):
+    """Loads a tiktoken encoding once per process (building BPE tables is slow)."""
+    return tiktoken.get_encoding(name)
+
+@functools.lru_cache(maxsize=4096)
+def _cached_token_count(text: str, encoding_name: str) -> int:
+    """Token count for a string, memoized for repeated prompts and messages."""
+    return len(_get_encoding(encoding_name).encode(text))
 
 class TokenEstimator:
     """Estimates token counts using tiktoken or approximation."""
@@ -32,9 +48,14 @@ class TokenEstimator:
         """Initializes the TokenEstimator."""
         self.tokenizer_name = tokenizer_model_name or DEFAULT_TOKENIZER_MODEL
         self.tokenizer = None
+        # Token counts for common short fields, looked up before the count cache
+        self._short_counts: Dict[str, int] = {}
         if tiktoken:
             try:
-                self.tokenizer = tiktoken.get_encoding(self.tokenizer_name)
+                self.tokenizer = _get_encoding(self.tokenizer_name)
+                self._short_counts = {
+                    s: len(self.tokenizer.encode(s)) for s in _COMMON_SHORT_STRINGS
+                }
                 logger.info(f"TokenEstimator initialized with tiktoken model: {self.tokenizer_name}")
             except Exception as e:
                 logger.error(f"Failed to load tiktoken model '{self.tokenizer_name}': {e}. Falling back to approximation.")
@@ -56,8 +77,7 @@ class TokenEstimator:
                 str_text = str(text)
                 if not str_text:
                     return TokenCount(0)
-                tokens = self.tokenizer.encode(str_text)
-                count = len(tokens)
+                count = self._count(str_text)
                 logger.debug(f"Estimated tokens for text (len {len(str_text)}): {count} (using {self.tokenizer_name})")
                 return TokenCount(count)
             except Exception as e:
@@ -91,21 +111,33 @@ class TokenEstimator:
 
         # Use tiktoken with overhead calculation (example for OpenAI models)
         # TODO: Verify if this overhead applies to Groq models or adjust
-        num_tokens = 0
         try:
+            # Structure overhead depends only on the message count: every message
+            # follows <im_start>{role/name}\n{content}<im_end>\n (4 tokens), every
+            # reply is primed with <im_start>assistant (2 tokens), and a message
+            # with a name omits its 1-token role
+            num_tokens = 4 * len(messages) + 2
+            num_tokens -= sum('name' in message for message in messages)
+            # Short fields come from the count cache; long ones (typically file
+            # contents) are collected and encoded together in one batch call
+            uncached: List[str] = []
+            short_counts = self._short_counts
             for message in messages:
-                # Add tokens for message structure overhead
-                num_tokens += 4  # Every message follows <im_start>{role/name}\n{content}<im_end>\n
-                # Add tokens for message content and role
-                for key, value in message.items():
+                for value in message.values():
                     content_str = str(value) if value is not None else ""
-                    if content_str:
-                         num_tokens += len(self.tokenizer.encode(content_str))
-                    if key == "name":  # If there's a name, the role is omitted
-                        num_tokens -= 1 # Role is always required and always 1 token (remove role estimate)
-            
-            # Add final tokens for assistant priming
-            num_tokens += 2  # Every reply is primed with <im_start>assistant
+                    if not content_str:
+                        continue
+                    count = short_counts.get(content_str)
+                    if count is not None:
+                        num_tokens += count
+                    elif len(content_str) <= _MAX_CACHED_TEXT_CHARS:
+                        num_tokens += _cached_token_count(
+                            content_str, self.tokenizer_name
+                        )
+                    else:
+                        uncached.append(content_str)
+            if uncached:
+                num_tokens += self._count_batch(uncached)
             
             logger.debug(f"Estimated tokens for {len(messages)} messages: {num_tokens} (using {self.tokenizer_name} + overhead)")
             return TokenCount(num_tokens)
@@ -115,4 +147,66 @@ class TokenEstimator:
              simple_sum = sum(self.estimate_tokens(msg.get('content', '')) for msg in messages)
              return TokenCount(simple_sum)
 
+    def estimate_tokens_for_message(self, message: ChatMessage) -> TokenCount:
+        """Estimates the tokens a single message contributes to a message list.
+
+        Includes the per-message structure overhead but not the reply priming
+        added once per list, so the total for a list equals the sum over its
+        messages plus `estimate_tokens_for_messages([])`. Lets callers that
+        drop messages one at a time keep a running total instead of
+        re-encoding the whole list.
+
+        Args:
+            message: The message to estimate.
+
+        Returns:
+            The estimated token count for the message.
+        """
+        if not self.tokenizer:
+            content_len = len(str(message.get('content', '')))
+            return TokenCount(content_len // APPROX_CHARS_PER_TOKEN + 5)
+        try:
+            return TokenCount(self._encode_message(message))
+        except Exception as e:
+            logger.warning(
+                f"tiktoken encoding failed for message: {e}. "
+                "Falling back to content estimate."
+            )
+            return self.estimate_tokens(message.get('content', ''))
+
+    def _count(self, text: str) -> int:
+        """Counts tiktoken tokens for a non-empty string."""
+        count = self._short_counts.get(text)
+        if count is not None:
+            return count
+        if len(text) <= _MAX_CACHED_TEXT_CHARS:
+            return _cached_token_count(text, self.tokenizer_name)
+        return len(self.tokenizer.encode(text))
+
+    def _count_batch(self, texts: List[str]) -> int:
+        """Counts tokens across several strings with one batched encode call.
+
+        tiktoken's `encode_batch` encodes on a thread pool with the GIL
+        released, replacing one Python-level `encode` call per string.
+        """
+        if len(texts) == 1:
+            return len(self.tokenizer.encode(texts[0]))
+        num_threads = min(len(texts), os.cpu_count() or 1)
+        encoded = self.tokenizer.encode_batch(texts, num_threads=num_threads)
+        return sum(map(len, encoded))
+
+    def _encode_message(self, message: ChatMessage) -> int:
+        """Counts tiktoken tokens for one message, including structure overhead."""
+        # Add tokens for message structure overhead
+        # Every message follows <im_start>{role/name}\n{content}<im_end>\n
+        num_tokens = 4
+        # Add tokens for message content and role
+        for key, value in message.items():
+            content_str = str(value) if value is not None else ""
+            if content_str:
+                 num_tokens += self._count(content_str)
+            if key == "name":  # If there's a name, the role is omitted
+                num_tokens -= 1 # Role is always required and always 1 token (remove role estimate)
+        return num_tokens
+
 # TODO: Add methods to estimate based on specific model if tokenization differs significantly 
\ No newline at end of file
@@ -1,14 +1,15 @@
 """Service for executing API calls with automatic retries.
 
-Implements exponential backoff for handling transient errors like
-rate limits (429) or temporary server issues (5xx). Includes fallback
-mechanisms (e.g., using cache or switching providers).
+Implements exponential backoff with decorrelated jitter for handling
+transient errors like rate limits (429) or temporary server issues (5xx).
+Includes fallback mechanisms (e.g., using cache or switching providers).
 """
 
 import logging
 import asyncio
+import random
 import time
-from typing import Any, Callable, Coroutine, Optional, Type, Tuple
+from typing import Any, Callable, Coroutine, Dict, Optional, Type, Tuple
 
 # Infrastructure Layer Imports
 # from .rate_limiter import RateLimiter
@@ -50,20 +51,58 @@ except ImportError:
     GroqAPIError = Exception
     GroqAuthenticationError = Exception
 
+def _exception_tuple(
+    *candidates: Type[BaseException],
+) -> Tuple[Type[BaseException], ...]:
+    """Builds an except-clause tuple, keeping the given (most common first) order.
+
+    Placeholders for providers that failed to import (bare `Exception`) and
+    duplicates are dropped; `except` checks the tuple left to right, so the
+    errors seen most often should come first.
+    """
+    found = tuple(dict.fromkeys(e for e in candidates if e is not Exception))
+    return found or (Exception,)
+
 # Combine known retryable/non-retryable errors from providers
 # Ensure base Exception is not included if specific types are found
-RETRYABLE_EXCEPTIONS = tuple(set(
-    e for e in [OpenAIRateLimitError, OpenAIAPIError, GroqRateLimitError, GroqAPIError]
-    if e is not Exception
-) or (Exception,)) # Fallback to generic Exception if none are imported
+RETRYABLE_EXCEPTIONS = _exception_tuple(
+    OpenAIRateLimitError, GroqRateLimitError, OpenAIAPIError, GroqAPIError
+) # Fallback to generic Exception if none are imported
 
-NON_RETRYABLE_EXCEPTIONS = tuple(set(
-    e for e in [OpenAIAuthenticationError, GroqAuthenticationError, ValueError, TypeError, ImportError]
-    if e is not Exception
-) or (Exception,)) # Fallback if none are imported
+NON_RETRYABLE_EXCEPTIONS = _exception_tuple(
+    OpenAIAuthenticationError, GroqAuthenticationError,
+    ValueError, TypeError, ImportError,
+) # Fallback if none are imported
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for a single jittered retry delay
+DEFAULT_MAX_BACKOFF_S = 60.0
+# Rate-limiter waits shorter than this are lock contention, not a deferral
+_DEFERRAL_THRESHOLD_S = 0.001
+
+def _dispatch_event(event: Any) -> None:
+    """Publishes a domain event (currently just logs it at DEBUG)."""
+    logger.debug(f"EVENT: {event}")
+    # In a real system, this would publish the event
+
+def _emit(enabled: bool, event_type: Type[Any], **fields: Any) -> None:
+    """Builds and dispatches an event only when `enabled`.
+
+    Callers pass the fields rather than an event, so nothing is built when
+    event logging is off.
+    """
+    if enabled:
+        _dispatch_event(event_type(**fields))
+
+# Fallback provider method, as resolved by name
+_AsyncMethod = Callable[..., Coroutine[Any, Any, Any]]
+
+# Retry policies an exception type can resolve to
+_NON_RETRYABLE = "non_retryable"
+_RETRYABLE = "retryable"
+_UNEXPECTED = "unexpected"
+
 # --- Custom Exceptions --- 
 class MaxRetryError(Exception):
     """Exception raised when max retries are exceeded."""
@@ -86,7 +125,8 @@ class ApiRetryService:
         fallback_provider_name: Optional[str] = None,
         max_retries: int = 5,
         initial_backoff_s: float = 1.0,
-        backoff_factor: float = 2.0,
+        backoff_factor: float = 3.0,
+        max_backoff_s: float = DEFAULT_MAX_BACKOFF_S,
         # TODO: Load retryable/non-retryable exceptions from config?
     ):
         """Initializes the ApiRetryService.
@@ -99,7 +139,10 @@ class ApiRetryService:
             fallback_provider_name: Name of the fallback provider (for logging/events).
             max_retries: Maximum number of retry attempts.
             initial_backoff_s: Initial delay in seconds for the first retry.
-            backoff_factor: Multiplier for the backoff delay (e.g., 2 for exponential).
+            backoff_factor: Multiplier for the upper bound of the next jittered delay
+                relative to the previous one. Defaults to 3, the standard factor for
+                decorrelated jitter (it was 2 when delays grew deterministically).
+            max_backoff_s: Cap in seconds for any single retry delay.
         """
         self.rate_limiter = rate_limiter
         self.cache_service = cache_service
@@ -109,17 +152,59 @@ class ApiRetryService:
         self.max_retries = max_retries
         self.initial_backoff_s = initial_backoff_s
         self.backoff_factor = backoff_factor
+        self.max_backoff_s = max_backoff_s
         self.retryable_exceptions = RETRYABLE_EXCEPTIONS
         self.non_retryable_exceptions = NON_RETRYABLE_EXCEPTIONS
+        # Retry policy per exception type, resolved on first occurrence
+        self._exception_policies: Dict[Type[BaseException], str] = {}
+        # Fallback provider methods resolved by name (None if missing/not callable)
+        self._fallback_methods: Dict[str, Optional[_AsyncMethod]] = {}
 
         logger.info(
             f"ApiRetryService initialized: max_retries={max_retries}, "
             f"initial_backoff={initial_backoff_s}s, factor={backoff_factor}, "
+            f"max_backoff={max_backoff_s}s, "
             f"Primary='{self.primary_provider_name}', Fallback='{self.fallback_provider_name or 'None'}'"
         )
         logger.debug(f"Retryable Exceptions: {self.retryable_exceptions}")
         logger.debug(f"Non-retryable Exceptions: {self.non_retryable_exceptions}")
 
+    def _next_backoff(self, previous_backoff: float) -> float:
+        """Returns the next retry delay using decorrelated jitter.
+
+        Each delay, the first included (with `previous_backoff` set to the
+        initial backoff), is drawn uniformly between the initial backoff and a
+        multiple of the previous delay, so concurrent callers that failed
+        together (e.g. on a 429) spread their retries out instead of waking in
+        lockstep.
+        """
+        upper = max(self.initial_backoff_s, previous_backoff * self.backoff_factor)
+        return min(self.max_backoff_s, random.uniform(self.initial_backoff_s, upper))
+
+    def _exception_policy(self, exc_type: Type[BaseException]) -> str:
+        """Classifies an exception type once; non-retryable takes precedence."""
+        try:
+            return self._exception_policies[exc_type]
+        except KeyError:
+            if issubclass(exc_type, self.non_retryable_exceptions):
+                policy = _NON_RETRYABLE
+            elif issubclass(exc_type, self.retryable_exceptions):
+                policy = _RETRYABLE
+            else:
+                policy = _UNEXPECTED
+            self._exception_policies[exc_type] = policy
+            return policy
+
+    def _get_fallback_method(self, name: str) -> Optional[_AsyncMethod]:
+        """Resolves a method on the fallback provider once and reuses it."""
+        try:
+            return self._fallback_methods[name]
+        except KeyError:
+            method = getattr(self.fallback_provider, name, None)
+            method = method if callable(method) else None
+            self._fallback_methods[name] = method
+            return method
+
     async def execute_with_retry(
         self, 
         func: Callable[..., Coroutine[Any, Any, Any]],
@@ -154,33 +239,39 @@ class ApiRetryService:
             Exception: If a non-retryable exception occurs.
         """
         last_exception: Optional[Exception] = None
-        current_backoff = self.initial_backoff_s
+        # Every delay, including the first, is drawn from this with jitter
+        previous_backoff = self.initial_backoff_s
         effective_provider_name = provider_name or self.primary_provider_name
         effective_endpoint = endpoint_name or func.__name__
 
         # TODO: Implement event dispatching (e.g., using a simple dispatcher or library)
-        def dispatch_event(event: Any):
-            logger.debug(f"EVENT: {event}")
-            # In a real system, this would publish the event
-            pass
+        # Events are only logged at DEBUG for now, so skip building them otherwise
+        debug = logger.isEnabledFor(logging.DEBUG)
 
         for attempt in range(self.max_retries + 1):
             try:
-                # 1. Wait for rate limit permission
-                wait_duration = await self.rate_limiter.get_wait_time()
-                if wait_duration > 0:
-                     dispatch_event(ApiCallDeferred(provider=effective_provider_name, endpoint=effective_endpoint, wait_time_seconds=wait_duration))
-                     await self.rate_limiter.wait_for_permission() # This call now includes the wait
-                else:
-                    # Still need to acquire the lock/timestamp if no wait needed
-                     await self.rate_limiter.wait_for_permission()
+                # 1. Wait for rate limit permission, reporting a deferral only if
+                # the limiter actually made us wait (no separate wait-time probe)
+                wait_start_ns = time.perf_counter_ns()
+                await self.rate_limiter.wait_for_permission()
+                wait_duration = (time.perf_counter_ns() - wait_start_ns) / 1_000_000_000
+                if wait_duration > _DEFERRAL_THRESHOLD_S:
+                    _emit(
+                        debug, ApiCallDeferred,
+                        provider=effective_provider_name,
+                        endpoint=effective_endpoint,
+                        wait_time_seconds=wait_duration,
+                    )
 
                 # 2. Execute the function
-                dispatch_event(ApiCallInitiated(provider=effective_provider_name, endpoint=effective_endpoint))
-                start_time = time.perf_counter()
+                _emit(
+                    debug, ApiCallInitiated,
+                    provider=effective_provider_name,
+                    endpoint=effective_endpoint,
+                )
+                start_ns = time.perf_counter_ns()
                 result = await func(*args, **kwargs)
-                end_time = time.perf_counter()
-                latency_ms = (end_time - start_time) * 1000
+                latency_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
                 
                 # Attempt to add latency to the result if it's a StructuredAIResponse
                 if hasattr(result, 'latency_ms') and result.latency_ms is None:
@@ -189,40 +280,69 @@ class ApiRetryService:
                 # Extract summary for event (e.g., token usage)
                 response_summary = getattr(result, 'token_usage', None) 
 
-                dispatch_event(ApiCallSucceeded(provider=effective_provider_name, endpoint=effective_endpoint, latency_ms=latency_ms, response_summary=response_summary))
+                _emit(
+                    debug, ApiCallSucceeded,
+                    provider=effective_provider_name,
+                    endpoint=effective_endpoint,
+                    latency_ms=latency_ms,
+                    response_summary=response_summary,
+                )
                 return result
 
-            except self.non_retryable_exceptions as e:
-                logger.error(f"Non-retryable error calling {effective_provider_name}.{effective_endpoint} on attempt {attempt + 1}: {e}", exc_info=True)
-                dispatch_event(ApiCallFailed(provider=effective_provider_name, endpoint=effective_endpoint, error_type=type(e).__name__, error_message=str(e)))
-                raise e # Propagate non-retryable errors immediately
-
-            except self.retryable_exceptions as e:
-                last_exception = e
-                logger.warning(
-                    f"Retryable error calling {effective_provider_name}.{effective_endpoint} on attempt {attempt + 1}/{self.max_retries + 1}: {type(e).__name__}. "
-                    f"Waiting {current_backoff:.2f}s..."
-                )
-                dispatch_event(RetryScheduled(provider=effective_provider_name, endpoint=effective_endpoint, attempt_number=attempt+1, delay_seconds=current_backoff))
-                if attempt < self.max_retries:
-                    await asyncio.sleep(current_backoff)
-                    current_backoff *= self.backoff_factor
-                else:
-                    logger.error(f"Max retries ({self.max_retries}) reached for {effective_provider_name}.{effective_endpoint}. Last error: {e}")
-                    break # Proceed to fallback logic
             except Exception as e:
-                # Catch any other unexpected exceptions
+                policy = self._exception_policy(type(e))
+                if policy is _NON_RETRYABLE:
+                    logger.error(f"Non-retryable error calling {effective_provider_name}.{effective_endpoint} on attempt {attempt + 1}: {e}", exc_info=True)
+                    _emit(
+                        debug, ApiCallFailed,
+                        provider=effective_provider_name,
+                        endpoint=effective_endpoint,
+                        error_type=type(e).__name__,
+                        error_message=str(e),
+                    )
+                    raise e # Propagate non-retryable errors immediately
+
                 last_exception = e
-                logger.error(f"Unexpected error calling {effective_provider_name}.{effective_endpoint} on attempt {attempt + 1}: {e}", exc_info=True)
-                # Decide whether to retry unexpected errors or fail fast
-                if attempt < self.max_retries:
-                     logger.warning(f"Retrying after unexpected error. Waiting {current_backoff:.2f}s...")
-                     dispatch_event(RetryScheduled(provider=effective_provider_name, endpoint=effective_endpoint, attempt_number=attempt+1, delay_seconds=current_backoff))
-                     await asyncio.sleep(current_backoff)
-                     current_backoff *= self.backoff_factor
+                if policy is _RETRYABLE:
+                    if attempt < self.max_retries:
+                        delay = self._next_backoff(previous_backoff)
+                        logger.warning(
+                            f"Retryable error calling {effective_provider_name}.{effective_endpoint} on attempt {attempt + 1}/{self.max_retries + 1}: {type(e).__name__}. "
+                            f"Waiting {delay:.2f}s..."
+                        )
+                        _emit(
+                            debug, RetryScheduled,
+                            provider=effective_provider_name,
+                            endpoint=effective_endpoint,
+                            attempt_number=attempt+1,
+                            delay_seconds=delay,
+                        )
+                        await asyncio.sleep(delay)
+                        previous_backoff = delay
+                    else:
+                        logger.error(f"Max retries ({self.max_retries}) reached for {effective_provider_name}.{effective_endpoint}. Last error: {e}")
+                        break # Proceed to fallback logic
                 else:
-                    logger.error(f"Max retries ({self.max_retries}) reached after unexpected error. Last error: {e}")
-                    break
+                    # Any other unexpected exception
+                    logger.error(f"Unexpected error calling {effective_provider_name}.{effective_endpoint} on attempt {attempt + 1}: {e}", exc_info=True)
+                    # Decide whether to retry unexpected errors or fail fast
+                    if attempt < self.max_retries:
+                        delay = self._next_backoff(previous_backoff)
+                        logger.warning(
+                            f"Retrying after unexpected error. Waiting {delay:.2f}s..."
+                        )
+                        _emit(
+                            debug, RetryScheduled,
+                            provider=effective_provider_name,
+                            endpoint=effective_endpoint,
+                            attempt_number=attempt+1,
+                            delay_seconds=delay,
+                        )
+                        await asyncio.sleep(delay)
+                        previous_backoff = delay
+                    else:
+                        logger.error(f"Max retries ({self.max_retries}) reached after unexpected error. Last error: {e}")
+                        break
 
         # --- If loop finishes without returning (i.e., max retries exceeded) --- 
         logger.warning(f"Primary API call failed definitively for {effective_provider_name}.{effective_endpoint}. Attempting fallbacks...")
@@ -246,21 +366,23 @@ class ApiRetryService:
         if use_provider_fallback and self.fallback_provider and self.fallback_provider_name:
             logger.warning(f"Attempting fallback from {effective_provider_name} to provider: {self.fallback_provider_name}")
             # Assuming the function/method exists on the fallback provider
-            fallback_func = getattr(self.fallback_provider, func.__name__, None)
-            if fallback_func and callable(fallback_func):
-                 dispatch_event(GroqApiFallbackTriggered( # TODO: Make event generic
-                      reason=f"Primary failed: {type(last_exception).__name__}", 
-                      fallback_provider=self.fallback_provider_name
-                 ))
+            fallback_func = self._get_fallback_method(func.__name__)
+            if fallback_func:
+                 _emit(debug, GroqApiFallbackTriggered, # TODO: Make event generic
+                       reason=f"Primary failed: {type(last_exception).__name__}",
+                       fallback_provider=self.fallback_provider_name)
                  try:
                      # Re-execute the call using the fallback provider, but WITHOUT further retries/fallbacks within this call
                      # Wait for rate limit on fallback provider (assumes same limiter for now)
                      await self.rate_limiter.wait_for_permission()
-                     dispatch_event(ApiCallInitiated(provider=self.fallback_provider_name, endpoint=effective_endpoint))
-                     start_time = time.perf_counter()
+                     _emit(
+                         debug, ApiCallInitiated,
+                         provider=self.fallback_provider_name,
+                         endpoint=effective_endpoint,
+                     )
+                     start_ns = time.perf_counter_ns()
                      fallback_result = await fallback_func(*args, **kwargs)
-                     end_time = time.perf_counter()
-                     latency_ms = (end_time - start_time) * 1000
+                     latency_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
                      
                      # Add metadata
                      if hasattr(fallback_result, 'latency_ms') and fallback_result.latency_ms is None:
@@ -269,11 +391,22 @@ class ApiRetryService:
                           fallback_result.provider = self.fallback_provider_name
                      
                      logger.info(f"Provider fallback to {self.fallback_provider_name} successful.")
-                     dispatch_event(ApiCallSucceeded(provider=self.fallback_provider_name, endpoint=effective_endpoint, latency_ms=latency_ms))
+                     _emit(
+                         debug, ApiCallSucceeded,
+                         provider=self.fallback_provider_name,
+                         endpoint=effective_endpoint,
+                         latency_ms=latency_ms,
+                     )
                      return fallback_result
                  except Exception as fallback_e:
                      logger.error(f"Provider fallback to {self.fallback_provider_name} failed: {fallback_e}", exc_info=True)
-                     dispatch_event(ApiCallFailed(provider=self.fallback_provider_name, endpoint=effective_endpoint, error_type=type(fallback_e).__name__, error_message=str(fallback_e)))
+                     _emit(
+                         debug, ApiCallFailed,
+                         provider=self.fallback_provider_name,
+                         endpoint=effective_endpoint,
+                         error_type=type(fallback_e).__name__,
+                         error_message=str(fallback_e),
+                     )
                      # Update last_exception to the fallback error
                      last_exception = fallback_e
             else:
@@ -282,7 +415,13 @@ class ApiRetryService:
         # If all retries and fallbacks failed
         final_error = last_exception or Exception("Unknown error after retries and fallbacks")
         logger.error(f"All retries and fallbacks failed for {effective_provider_name}.{effective_endpoint}. Raising MaxRetryError.")
-        dispatch_event(ApiCallFailed(provider=effective_provider_name, endpoint=effective_endpoint, error_type=type(final_error).__name__, error_message=str(final_error)))
+        _emit(
+            debug, ApiCallFailed,
+            provider=effective_provider_name,
+            endpoint=effective_endpoint,
+            error_type=type(final_error).__name__,
+            error_message=str(final_error),
+        )
         raise MaxRetryError(final_error, self.max_retries)
 
 # TODO: Add RequestQueueService and BatchingService placeholders/implementations if needed 
\ No newline at end of file
@@ -1,13 +1,15 @@
 """Implementation of a rate limiter.
 
 Controls the frequency of outgoing requests to prevent hitting API rate limits.
-Uses a simple token bucket or sliding window algorithm.
+Uses the sliding window from sliding_window.py.
 """
 
-import time
 import asyncio
 import logging
 from collections import deque
+from typing import Deque, Optional
+
+from goscli.infrastructure.resilience.sliding_window import SlidingWindow
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +18,10 @@ DEFAULT_MAX_REQUESTS = 5 # Example: Max 5 requests...
 DEFAULT_TIME_WINDOW_SECONDS = 60 # ...per 60 seconds
 
 class RateLimiter:
-    """Simple sliding window rate limiter."""
+    """Asyncio rate limiter over a SlidingWindow.
+
+    Allows at most `max_requests` within any `time_window` seconds.
+    """
 
     def __init__(
         self,
@@ -31,51 +36,72 @@ class RateLimiter:
         """
         self.max_requests = max_requests
         self.time_window = time_window
-        self.timestamps = deque()
+        self._window = SlidingWindow(max_requests, time_window)
         self._lock = asyncio.Lock()
+        # Callers blocked on a full window, granted in FIFO order by a single timer
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._release_handle: Optional[asyncio.TimerHandle] = None
         logger.info(f"RateLimiter initialized: {max_requests} requests / {time_window} seconds")
 
-    def _cleanup_timestamps(self) -> None:
-        """Removes timestamps older than the time window."""
-        now = time.monotonic()
-        while self.timestamps and now - self.timestamps[0] > self.time_window:
-            self.timestamps.popleft()
-
     async def wait_for_permission(self) -> None:
-        """Waits until a request is permitted according to the rate limit."""
-        while True:
-            async with self._lock:
-                self._cleanup_timestamps()
-                if len(self.timestamps) < self.max_requests:
-                    # Permission granted, record timestamp
-                    self.timestamps.append(time.monotonic())
-                    logger.debug("Rate limit permission granted.")
-                    return # Exit loop
-                else:
-                    # Calculate wait time
-                    oldest_timestamp = self.timestamps[0]
-                    wait_time = oldest_timestamp + self.time_window - time.monotonic()
-                    wait_time = max(0, wait_time) # Ensure non-negative
-
-            if wait_time > 0:
-                 logger.debug(f"Rate limit reached. Waiting for {wait_time:.2f} seconds.")
-                 await asyncio.sleep(wait_time)
-            # Loop again to re-check condition after waiting
+        """Waits until a request is permitted according to the rate limit.
+
+        When the window is full the caller queues a future instead of polling;
+        a single timer grants queued callers in order as slots expire, so
+        waiters are never woken just to find the window still full.
+        """
+        # No awaits between the check and the grant, so this is race-free
+        # within the event loop without taking the lock
+        if not self._waiters and self._window.try_acquire():
+            logger.debug("Rate limit permission granted.")
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._schedule_release()
+        logger.debug(
+            f"Rate limit reached. Queued behind {len(self._waiters) - 1} waiter(s)."
+        )
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Drop the queue entry if it was not granted yet; a slot granted in
+            # the same tick as the cancellation simply goes unused
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+        logger.debug("Rate limit permission granted after waiting.")
+
+    def _schedule_release(self) -> None:
+        """Arms the release timer for when the oldest grant leaves the window."""
+        if self._release_handle is not None or not self._waiters:
+            return
+        delay = self._window.time_until_available()
+        loop = asyncio.get_running_loop()
+        self._release_handle = loop.call_later(delay, self._release)
+
+    def _release(self) -> None:
+        """Grants freed slots to queued waiters, oldest first."""
+        self._release_handle = None
+        while self._waiters:
+            if self._waiters[0].done(): # Cancelled while queued
+                self._waiters.popleft()
+                continue
+            if not self._window.try_acquire():
+                break
+            self._waiters.popleft().set_result(None)
+        self._schedule_release()
 
     # Optional: Synchronous check method (use with caution in async code)
     # def can_request_sync(self) -> bool:
     #     with self._lock: # Need appropriate sync lock if used outside async context
-    #         self._cleanup_timestamps()
-    #         return len(self.timestamps) < self.max_requests
+    #         return self._window.has_capacity()
 
     # Optional: Method to get estimated wait time without waiting
     async def get_wait_time(self) -> float:
          """Estimates the time needed before the next request can be made."""
          async with self._lock:
-             self._cleanup_timestamps()
-             if len(self.timestamps) < self.max_requests:
-                 return 0.0
-             else:
-                 oldest_timestamp = self.timestamps[0]
-                 wait_time = oldest_timestamp + self.time_window - time.monotonic()
-                 return max(0.0, wait_time) 
\ No newline at end of file
+             return self._window.time_until_available() 
\ No newline at end of file
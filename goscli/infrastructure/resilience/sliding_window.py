@@ -0,0 +1,72 @@
+"""Sliding window shared by the rate limiters.
+
+The async `resilience.rate_limiter.RateLimiter` and the synchronous
+`services.rate_limiter.RateLimiter` are thin front-ends over this window;
+they differ only in how callers wait for a free slot.
+"""
+
+import time
+from collections import deque
+from threading import Lock
+from typing import Deque
+
+NS_PER_SECOND = 1_000_000_000
+
+
+class SlidingWindow:
+    """Grants at most `max_requests` within any `time_window` seconds.
+
+    Grant times are kept as time.monotonic_ns() ints, oldest first; a slot
+    frees up exactly `time_window` after the grant that used it. The lock is
+    never held across an await, so the window is safe to use from both
+    threads and coroutines.
+    """
+
+    def __init__(self, max_requests: int, time_window: float):
+        """Initializes an empty window.
+
+        Args:
+            max_requests: Maximum number of requests allowed in the window.
+            time_window: The window length in seconds.
+        """
+        if max_requests <= 0 or time_window <= 0:
+            raise ValueError("Max requests and time window must be positive.")
+        self.max_requests = max_requests
+        self.window_ns = int(time_window * NS_PER_SECOND)
+        self.timestamps: Deque[int] = deque()
+        self._lock = Lock()
+
+    def _cleanup(self, now: int) -> None:
+        """Removes grants that have left the window (call with the lock held)."""
+        timestamps = self.timestamps
+        while timestamps and now - timestamps[0] >= self.window_ns:
+            timestamps.popleft()
+
+    def has_capacity(self) -> bool:
+        """Whether another request fits in the window now."""
+        with self._lock:
+            self._cleanup(time.monotonic_ns())
+            return len(self.timestamps) < self.max_requests
+
+    def try_acquire(self) -> bool:
+        """Records a request if one fits in the window.
+
+        Returns:
+            True if the request was granted, False if the window is full.
+        """
+        with self._lock:
+            now = time.monotonic_ns()
+            self._cleanup(now)
+            if len(self.timestamps) >= self.max_requests:
+                return False
+            self.timestamps.append(now)
+            return True
+
+    def time_until_available(self) -> float:
+        """Seconds until a slot frees up, or 0.0 if one is free now."""
+        with self._lock:
+            now = time.monotonic_ns()
+            self._cleanup(now)
+            if len(self.timestamps) < self.max_requests:
+                return 0.0
+            return (self.timestamps[0] + self.window_ns - now) / NS_PER_SECOND
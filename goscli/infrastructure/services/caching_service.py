@@ -1,8 +1,14 @@
 import functools
 import hashlib
 import logging
+import os
+import threading
 import time # Added for sliding TTL
-from typing import Any, Callable, Optional, Tuple, List
+import weakref
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple, List, Iterable
 
 import diskcache as dc
 
@@ -16,10 +22,26 @@ logger = logging.getLogger(__name__)
 # L1 Cache (In-Memory) - Simple LRU cache
 # Size can be adjusted based on expected usage patterns
 L1_CACHE_SIZE = 128 
+# Expired L1 entries are otherwise dropped lazily; sweep them every N puts too
+_L1_PRUNE_INTERVAL = 256
+# L1 expiry times are monotonic_ns() ints
+_NS_PER_SECOND = 1_000_000_000
 
 # L2 Cache (File-Based)
 # Directory will be created in the user's cache directory
 CACHE_DIR = "goscli_cache"
+# Number of SQLite shards for the L2 cache, so concurrent writers rarely contend
+L2_CACHE_SHARDS = 8
+# The sharded L2 cache lives in this subdirectory of the cache directory; the
+# top level holds the single-file cache used before sharding
+L2_SHARDS_SUBDIR = "shards"
+_LEGACY_L2_FILES = ("cache.db", "cache.db-wal", "cache.db-shm")
+# L2 writes are buffered and flushed by a background thread; a burst of puts
+# within this delay is written in one flush
+L2_FLUSH_DELAY_SECONDS = 0.05
+# Pickle protocol for L2 values; pinned because diskcache persists its settings
+# in the cache directory, so an old cache would otherwise keep its old protocol
+L2_PICKLE_PROTOCOL = 5
 # L2 Default TTL (e.g., 24 hours)
 L2_DEFAULT_TTL_SECONDS = 60 * 60 * 24 
 # L1 Default TTL (e.g., 15 minutes)
@@ -31,6 +53,151 @@ L3_DEFAULT_TTL_SECONDS = 60 * 60 * 24 * 7
 ENABLE_SLIDING_TTL = True
 SLIDING_TTL_EXTENSION_SECONDS = 60 * 60 # Extend by 1 hour on access
 
+# TinyLFU admission: the frequency sketch tracks ~10 accesses per L1 slot
+# before its counters are halved, so old popularity fades out
+_SKETCH_SAMPLES_PER_ENTRY = 10
+_SKETCH_SEEDS = (
+    0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x27D4EB2F165667C5
+)
+_SKETCH_MAX_COUNT = 15 # 4-bit counters
+
+class _FrequencySketch:
+    """Count-min sketch of recent key access frequency (TinyLFU)."""
+
+    def __init__(self, capacity: int):
+        sample_size = max(1, capacity) * _SKETCH_SAMPLES_PER_ENTRY
+        width = 1 << max(4, (sample_size - 1).bit_length())
+        self._mask = width - 1
+        self._table = array('B', bytes(width))
+        self._sample_size = sample_size
+        self._additions = 0
+
+    def _indexes(self, key: str) -> List[int]:
+        h = hash(key)
+        return [
+            (((h ^ seed) * 0x9E3779B97F4A7C15) >> 32) & self._mask
+            for seed in _SKETCH_SEEDS
+        ]
+
+    def increment(self, key: str) -> None:
+        """Records one access to key, decaying all counters periodically."""
+        table = self._table
+        for i in self._indexes(key):
+            if table[i] < _SKETCH_MAX_COUNT:
+                table[i] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._table = array('B', (count >> 1 for count in table))
+            self._additions //= 2
+
+    def frequency(self, key: str) -> int:
+        """Estimated recent access count for key (may overestimate)."""
+        table = self._table
+        return min(table[i] for i in self._indexes(key))
+
+class _L2Writer:
+    """Buffers L2 writes and flushes them to disk from a background thread.
+
+    Holds no reference to the owning CachingService, so the service can be
+    garbage-collected while the thread is alive; the service's finalizer
+    calls stop() to flush what is left.
+    """
+
+    def __init__(self, disk_cache: dc.FanoutCache):
+        self._disk_cache = disk_cache
+        # key -> (value, ttl); duplicate keys coalesce
+        self._pending: Dict[str, Tuple[Any, int]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def queue(self, key: str, value: Any, ttl: int) -> None:
+        """Queues a write, starting the writer thread on first use."""
+        with self._lock:
+            self._pending[key] = (value, ttl)
+            if self._thread is None and not self._stopping:
+                self._thread = threading.Thread(
+                    target=self._run, name="goscli-l2-writer", daemon=True
+                )
+                self._thread.start()
+        if self._stopping:
+            self.flush() # Writer already stopped: write through
+        else:
+            self._wake.set()
+
+    def pending_values(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Values of the given keys that are queued but not yet on disk."""
+        with self._lock:
+            pending = self._pending
+            return {key: pending[key][0] for key in keys if key in pending}
+
+    def discard_pending(self) -> None:
+        """Drops all queued writes."""
+        with self._lock:
+            self._pending.clear()
+
+    def _run(self) -> None:
+        """Waits for queued writes and flushes them in batches."""
+        while not self._stopping:
+            self._wake.wait()
+            if not self._stopping:
+                time.sleep(L2_FLUSH_DELAY_SECONDS) # Let a burst of puts coalesce
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes all queued entries to disk."""
+        with self._lock:
+            self._wake.clear()
+            batch = dict(self._pending)
+        if not batch:
+            return
+        written = 0
+        for key, (value, ttl) in batch.items():
+            try:
+                # FanoutCache routes each key to one shard, so a set only locks
+                # that shard; a transact() here would lock every shard at once
+                written += bool(self._disk_cache.set(key, value, expire=ttl))
+            except Exception as e:
+                logger.error(
+                    f"Error writing to L2 cache (key: {key[:10]}...): {e}",
+                    exc_info=True,
+                )
+        logger.debug(f"L2 Cache flushed {written}/{len(batch)} queued write(s).")
+        with self._lock:
+            # Keep entries that were re-queued with a newer value during the flush
+            for key, entry in batch.items():
+                if self._pending.get(key) is entry:
+                    del self._pending[key]
+
+    def stop(self) -> None:
+        """Stops the writer thread and flushes queued writes."""
+        self._stopping = True
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self.flush()
+
+def _remove_legacy_l2_cache(cache_dir: str) -> None:
+    """Deletes the pre-sharding L2 cache (a single cache.db in cache_dir).
+
+    Its entries cannot be migrated: they were keyed by SHA-256 digests, while
+    keys are now BLAKE2b digests, so none of them would ever be hit again.
+    """
+    if not os.path.isfile(os.path.join(cache_dir, _LEGACY_L2_FILES[0])):
+        return
+    try:
+        with dc.Cache(cache_dir) as legacy:
+            legacy.clear() # Also deletes values stored in separate files
+        for name in _LEGACY_L2_FILES:
+            path = os.path.join(cache_dir, name)
+            if os.path.exists(path):
+                os.remove(path)
+        logger.info(f"Removed legacy L2 cache at: {cache_dir}")
+    except Exception as e:
+        logger.warning(f"Failed to remove legacy L2 cache at {cache_dir}: {e}")
+
 class CachingService:
     """Provides multi-level caching (L1: in-memory, L2: disk-based, L3: vector placeholder)."""
 
@@ -41,21 +208,44 @@ class CachingService:
         """Initializes the CachingService."""
         self.l2_default_ttl = l2_default_ttl
         self.l1_default_ttl = l1_default_ttl
-        self._l1_expiry: dict[str, float] = {} # Store expiry times for L1 entries
+        self._l1_ttl_ns = int(l1_default_ttl * _NS_PER_SECOND)
         
         # Initialize L2 Disk Cache
         try:
+            _remove_legacy_l2_cache(cache_dir)
             # Diskcache uses seconds for expire
-            self.disk_cache = dc.Cache(cache_dir, timeout=1, expire=self.l2_default_ttl) 
+            self.disk_cache = dc.FanoutCache(
+                os.path.join(cache_dir, L2_SHARDS_SUBDIR),
+                shards=L2_CACHE_SHARDS, timeout=1,
+                expire=self.l2_default_ttl,
+                disk_pickle_protocol=L2_PICKLE_PROTOCOL,
+            )
             logger.info(f"Initialized L2 disk cache at: {self.disk_cache.directory} with default TTL: {self.l2_default_ttl}s")
         except Exception as e:
             logger.error(f"Failed to initialize L2 disk cache at {cache_dir}: {e}", exc_info=True)
             self.disk_cache = None
 
-        # Initialize L1 In-Memory Cache (Simple dictionary + expiry tracking)
-        self._memory_cache: dict[str, Any] = {}
-        self._memory_cache_keys: list[str] = [] 
+        # L2 puts are queued and written by a background thread
+        self._l2_writer: Optional[_L2Writer] = None
+        if self.disk_cache is not None:
+            self._l2_writer = _L2Writer(self.disk_cache)
+        # Flushes queued L2 writes when the service is closed, collected, or at
+        # exit
+        self._finalizer = None
+        if self._l2_writer is not None:
+            self._finalizer = weakref.finalize(self, self._l2_writer.stop)
+
+        # Cache key -> Future of the cache_result call currently computing it
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        # Initialize L1 In-Memory Cache: key -> (value, expiry), kept in LRU order
+        # (least recently used first) so hits and evictions are O(1)
+        self._memory_cache: OrderedDict[str, Tuple[Any, float]] = OrderedDict()
         self._l1_max_size = L1_CACHE_SIZE
+        # Access frequencies used to decide whether a new key may displace the LRU one
+        self._l1_sketch = _FrequencySketch(self._l1_max_size)
+        self._l1_puts = 0
         logger.info(f"Initialized L1 in-memory cache with size: {self._l1_max_size}, TTL: {self.l1_default_ttl}s")
         
         # Initialize L3 Vector Cache Placeholder
@@ -69,114 +259,148 @@ class CachingService:
         kwargs.pop('l1_ttl_seconds', None)
         kwargs.pop('l2_ttl_seconds', None)
         
-        key_parts = [prefix]
-        key_parts.extend(map(str, args))
+        # Not security-sensitive: BLAKE2b with a 128-bit digest is faster than SHA-256.
+        # Parts are fed to the hasher one at a time (same bytes as joining them
+        # with "|"), so a long prompt argument is never copied into a combined
+        # key string.
+        hasher = hashlib.blake2b(prefix.encode('utf-8'), digest_size=16)
+        for arg in args:
+            hasher.update(b'|')
+            hasher.update(str(arg).encode('utf-8'))
         # Ensure consistent order for kwargs
-        key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
-        key_string = "|".join(key_parts)
-        return hashlib.sha256(key_string.encode('utf-8')).hexdigest()
+        for k, v in sorted(kwargs.items()):
+            hasher.update(b'|')
+            hasher.update(f"{k}={v}".encode('utf-8'))
+        return hasher.hexdigest()
 
     # --- L1 Cache Operations ---
     def _prune_l1_cache(self) -> None:
         """Removes expired or LRU items from L1 cache."""
-        now = time.monotonic()
+        now = time.monotonic_ns()
         # Remove expired items first
-        expired_keys = [k for k, expiry in self._l1_expiry.items() if expiry < now]
+        expired_keys = [
+            k for k, (_, expiry) in self._memory_cache.items() if expiry < now
+        ]
         for key in expired_keys:
-            if key in self._memory_cache: del self._memory_cache[key]
-            if key in self._l1_expiry: del self._l1_expiry[key]
-            if key in self._memory_cache_keys: self._memory_cache_keys.remove(key)
+            del self._memory_cache[key]
             logger.debug(f"L1 Cache EXPIRED key: {key[:10]}...")
 
         # Enforce max size using LRU if needed after expiry pruning
         while len(self._memory_cache) > self._l1_max_size:
-            if not self._memory_cache_keys:
-                break # Should not happen if cache is not empty
-            lru_key = self._memory_cache_keys.pop(0)
-            if lru_key in self._memory_cache: del self._memory_cache[lru_key]
-            if lru_key in self._l1_expiry: del self._l1_expiry[lru_key]
+            lru_key, _ = self._memory_cache.popitem(last=False)
             logger.debug(f"L1 Cache EVICTED key (LRU): {lru_key[:10]}...")
 
     def _get_from_memory(self, key: str) -> Optional[Any]:
         """Gets an item from L1, checking expiry and applying sliding TTL."""
-        self._prune_l1_cache() # Prune before getting
-        now = time.monotonic()
-        if key in self._memory_cache and key in self._l1_expiry and self._l1_expiry[key] > now:
-            # Cache Hit & Not Expired
-            self._memory_cache_keys.remove(key)
-            self._memory_cache_keys.append(key) # Update LRU order
-            
-            # Implement Sliding TTL for L1
-            if ENABLE_SLIDING_TTL:
-                new_expiry = now + self.l1_default_ttl # Reset TTL on access
-                self._l1_expiry[key] = new_expiry
-                logger.debug(f"L1 Cache HIT (Sliding TTL applied) for key: {key[:10]}... New Expiry: {new_expiry:.0f}")
-            else:
-                 logger.debug(f"L1 Cache HIT for key: {key[:10]}...")
-            return self._memory_cache[key]
-            
-        # Cache Miss or Expired
-        if key in self._memory_cache: # Clean up if expired but not pruned somehow
+        self._l1_sketch.increment(key)
+        entry = self._memory_cache.get(key)
+        if entry is not None:
+            value, expiry = entry
+            now = time.monotonic_ns()
+            if expiry > now:
+                # Cache Hit & Not Expired
+                self._memory_cache.move_to_end(key) # Update LRU order
+
+                # Implement Sliding TTL for L1
+                if ENABLE_SLIDING_TTL:
+                    new_expiry = now + self._l1_ttl_ns # Reset TTL on access
+                    self._memory_cache[key] = (value, new_expiry)
+                    logger.debug(
+                        f"L1 Cache HIT (Sliding TTL applied) for key: {key[:10]}... "
+                        f"New Expiry: {new_expiry // _NS_PER_SECOND}"
+                    )
+                else:
+                    logger.debug(f"L1 Cache HIT for key: {key[:10]}...")
+                return value
+
+            # Expired: drop it now rather than waiting for a prune
             del self._memory_cache[key]
-            del self._l1_expiry[key]
-            if key in self._memory_cache_keys: self._memory_cache_keys.remove(key)
         logger.debug(f"L1 Cache MISS for key: {key[:10]}...")
         return None
 
     def _put_in_memory(self, key: str, value: Any, ttl_seconds: Optional[int]) -> None:
         """Puts an item into L1 with TTL, managing size."""
-        self._prune_l1_cache() # Prune before putting
         effective_ttl = ttl_seconds if ttl_seconds is not None else self.l1_default_ttl
-        expiry_time = time.monotonic() + effective_ttl
-        
+        expiry_time = time.monotonic_ns() + int(effective_ttl * _NS_PER_SECOND)
+        self._l1_sketch.increment(key)
+        self._l1_puts += 1
+        if self._l1_puts % _L1_PRUNE_INTERVAL == 0:
+            self._prune_l1_cache() # Periodic sweep so expired values don't linger
+
         if key in self._memory_cache:
-            self._memory_cache_keys.remove(key)
+            self._memory_cache.move_to_end(key)
         elif len(self._memory_cache) >= self._l1_max_size:
-            # Evict LRU if pruning didn't make space
-             if self._memory_cache_keys:
-                lru_key = self._memory_cache_keys.pop(0)
-                if lru_key in self._memory_cache: del self._memory_cache[lru_key]
-                if lru_key in self._l1_expiry: del self._l1_expiry[lru_key]
+            # Full: drop expired entries first, then evict LRU if still no space
+            self._prune_l1_cache()
+            if len(self._memory_cache) >= self._l1_max_size:
+                lru_key = next(iter(self._memory_cache))
+                # TinyLFU admission: a key seen less often than the LRU victim
+                # (e.g. a one-off lookup during a scan) stays in L2 only
+                if self._l1_sketch.frequency(key) < self._l1_sketch.frequency(lru_key):
+                    logger.debug(
+                        "L1 Cache REJECTED key (less frequent than LRU): "
+                        f"{key[:10]}..."
+                    )
+                    return
+                del self._memory_cache[lru_key]
                 logger.debug(f"L1 Cache EVICTED key (LRU on put): {lru_key[:10]}...")
 
-        self._memory_cache[key] = value
-        self._l1_expiry[key] = expiry_time
-        self._memory_cache_keys.append(key)
+        self._memory_cache[key] = (value, expiry_time)
         logger.debug(f"L1 Cache PUT key: {key[:10]}... TTL: {effective_ttl}s")
 
     # --- L2 Cache Operations ---
     def _get_from_disk(self, key: str) -> Optional[Any]:
-        """Gets an item from L2, applying sliding TTL if enabled."""
+        """Gets an item from L2 (queued writes first, then disk)."""
         if self.disk_cache is None: return None
+        # Writes still waiting for the background flush are visible immediately
+        pending = self._l2_writer.pending_values((key,))
+        if pending:
+            logger.debug(f"L2 Cache HIT (pending write) for key: {key[:10]}...")
+            return pending[key]
         try:
-            # Diskcache get doesn't automatically slide TTL, we need to reset it on hit
-            value = self.disk_cache.get(key, default=None, expire_time=ENABLE_SLIDING_TTL)
+            # Plain get: expire_time=True returns a (value, expire_time) tuple,
+            # which made every miss look like a hit
+            value = self.disk_cache.get(key, default=None)
             if value is not None:
                 logger.debug(f"L2 Cache HIT for key: {key[:10]}...")
-                # Manually update expiry if sliding TTL is desired (more involved)
-                # Diskcache v5.2+ `expire_time=True` *should* handle sliding TTL on get.
-                # If using older version or explicit control needed:
-                # if ENABLE_SLIDING_TTL:
-                #     current_ttl = self.disk_cache.get(key, default=None, read=True).expire # Read expiry without resetting
-                #     if current_ttl is not None: # Check if TTL exists
-                #          new_expire = time.time() + self.l2_default_ttl # Reset based on access time
-                #          self.disk_cache.touch(key, expire=new_expire) # Update TTL
-                #          logger.debug(f"L2 Sliding TTL applied for key {key[:10]}... New Expiry: {new_expire:.0f}")
+                # L2 expiry is not extended on read; the hit is promoted to L1,
+                # which applies the sliding TTL. Sliding L2 as well would need
+                # self.disk_cache.touch(key, expire=self.l2_default_ttl) here.
                 return value
         except Exception as e:
             logger.error(f"Error getting from L2 cache (key: {key[:10]}...): {e}", exc_info=True)
         logger.debug(f"L2 Cache MISS for key: {key[:10]}...")
         return None
 
+    def _get_many_from_disk(self, keys: List[str]) -> Dict[str, Any]:
+        """Looks up several L2 keys (queued writes first, then disk)."""
+        if self.disk_cache is None:
+            return {}
+        hits = self._l2_writer.pending_values(keys)
+        # Plain reads, no transaction: transact() would take write locks on
+        # every shard and block the L2 writer for the whole batch
+        for key in keys:
+            if key in hits:
+                continue
+            try:
+                value = self.disk_cache.get(key, default=None)
+            except Exception as e:
+                logger.error(
+                    f"Error getting from L2 cache (key: {key[:10]}...): {e}",
+                    exc_info=True,
+                )
+                continue
+            if value is not None:
+                hits[key] = value
+        logger.debug(f"L2 Cache batch lookup: {len(hits)}/{len(keys)} hit(s).")
+        return hits
+
     def _put_in_disk(self, key: str, value: Any, ttl_seconds: Optional[int]) -> None:
-        """Puts an item into L2 with specified TTL."""
+        """Queues an item for L2 with specified TTL (written by a background thread)."""
         if self.disk_cache is None: return
         effective_ttl = ttl_seconds if ttl_seconds is not None else self.l2_default_ttl
-        try:
-            self.disk_cache.set(key, value, expire=effective_ttl)
-            logger.debug(f"L2 Cache PUT key: {key[:10]}... TTL: {effective_ttl}s")
-        except Exception as e:
-            logger.error(f"Error putting into L2 cache (key: {key[:10]}...): {e}", exc_info=True)
+        self._l2_writer.queue(key, value, effective_ttl)
+        logger.debug(f"L2 Cache PUT (queued) key: {key[:10]}... TTL: {effective_ttl}s")
 
     # --- L3 Vector Cache Operations (Placeholder) ---
     def _find_similar_in_vector_cache(self, query_text: str, threshold: float = 0.8) -> Optional[Any]:
@@ -213,7 +437,10 @@ class CachingService:
         """Retrieves item from cache (L1 -> L2 -> L3 placeholder)."""
         key = self._generate_key(prefix, *args, **kwargs)
         l1_ttl = kwargs.pop('l1_ttl_seconds', None)
-        
+        return self._get_by_key(key, l1_ttl)
+
+    def _get_by_key(self, key: str, l1_ttl: Optional[int] = None) -> Optional[Any]:
+        """Looks up an already generated key (L1 -> L2 -> L3 placeholder)."""
         value = self._get_from_memory(key)
         if value is not None: return value
 
@@ -242,7 +469,11 @@ class CachingService:
         l1_ttl = kwargs.pop('l1_ttl_seconds', None)
         l2_ttl = kwargs.pop('l2_ttl_seconds', None)
         key = self._generate_key(prefix, *args, **kwargs)
-        
+        self._put_by_key(key, value, l1_ttl, l2_ttl)
+
+    def _put_by_key(self, key: str, value: Any, l1_ttl: Optional[int] = None,
+                    l2_ttl: Optional[int] = None) -> None:
+        """Stores a value under an already generated key in L1 and L2."""
         self._put_in_memory(key, value, ttl_seconds=l1_ttl)
         self._put_in_disk(key, value, ttl_seconds=l2_ttl)
         
@@ -252,6 +483,53 @@ class CachingService:
         # if text_to_embed:
         #      self._put_in_vector_cache(key, text_to_embed, value)
 
+    def get_many(self, prefix: str, args_list: Iterable[Any]) -> Dict[Any, Any]:
+        """Retrieves several items sharing a prefix in one call.
+
+        Args:
+            prefix: The cache key prefix, as passed to `get`.
+            args_list: One entry per lookup; a tuple is unpacked as the
+                positional args, anything else is used as the single arg.
+                Entries must be hashable.
+
+        Returns:
+            A dict mapping each entry of `args_list` that was found to its value.
+        """
+        hits: Dict[Any, Any] = {}
+        disk_lookups: Dict[str, Any] = {}
+        for args in args_list:
+            key = self._generate_key(
+                prefix, *(args if isinstance(args, tuple) else (args,))
+            )
+            value = self._get_from_memory(key)
+            if value is not None:
+                hits[args] = value
+            else:
+                disk_lookups[key] = args
+        if disk_lookups:
+            for key, value in self._get_many_from_disk(list(disk_lookups)).items():
+                self._put_in_memory(key, value, ttl_seconds=None)
+                hits[disk_lookups[key]] = value
+        return hits
+
+    def put_many(self, prefix: str, items: Dict[Any, Any],
+                 l1_ttl_seconds: Optional[int] = None,
+                 l2_ttl_seconds: Optional[int] = None) -> None:
+        """Stores several items sharing a prefix.
+
+        Args:
+            prefix: The cache key prefix, as passed to `put`.
+            items: Maps each args entry (see `get_many`) to the value to store.
+            l1_ttl_seconds: Optional L1 TTL override.
+            l2_ttl_seconds: Optional L2 TTL override.
+        """
+        for args, value in items.items():
+            key = self._generate_key(
+                prefix, *(args if isinstance(args, tuple) else (args,))
+            )
+            # L2 writes are queued and flushed together by the writer thread
+            self._put_by_key(key, value, l1_ttl_seconds, l2_ttl_seconds)
+
     def clear(self, level: str = 'all') -> None:
         """Clears the cache.
 
@@ -260,11 +538,10 @@ class CachingService:
         """
         if level in ['l1', 'all']:
             self._memory_cache.clear()
-            self._memory_cache_keys.clear()
-            self._l1_expiry.clear()
             logger.info("Cleared L1 (in-memory) cache.")
         
         if level in ['l2', 'all'] and self.disk_cache is not None:
+            self._l2_writer.discard_pending()
             try:
                 count = self.disk_cache.clear()
                 logger.info(f"Cleared L2 (disk) cache. Removed {count} items.")
@@ -274,6 +551,13 @@ class CachingService:
              # self.vector_cache.clear()
              # logger.info("Cleared L3 (vector) cache.")
 
+    def close(self) -> None:
+        """Flushes queued L2 writes, stops the writer and closes the disk cache."""
+        if self._finalizer is not None:
+            self._finalizer() # Runs _L2Writer.stop at most once
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+
     # --- Decorator (Optional convenience) ---
     def cache_result(self, prefix: str, ttl_seconds: Optional[int] = None) -> Callable:
         """Decorator to cache the result of a function.
@@ -292,17 +576,44 @@ class CachingService:
                 l1_ttl = kwargs.pop('l1_ttl_seconds', None)
                 l2_ttl = kwargs.pop('l2_ttl_seconds', ttl_seconds) # Use decorator ttl for L2 if provided
                 
-                cached_value = self.get(prefix, *args, **kwargs, l1_ttl_seconds=l1_ttl)
+                # Generate the key once for both the lookup and the store
+                key = self._generate_key(prefix, *args, **kwargs)
+                cached_value = self._get_by_key(key, l1_ttl)
                 if cached_value is not None:
                     return cached_value
-                result = func(*args, **kwargs)
-                # Pass TTLs to put method
-                self.put(result, prefix, *args, **kwargs, l1_ttl_seconds=l1_ttl, l2_ttl_seconds=l2_ttl)
-                return result
+
+                # Coalesce concurrent misses on the same key onto one call of func
+                with self._inflight_lock:
+                    pending = self._inflight.get(key)
+                    leader = pending is None
+                    if leader:
+                        pending = self._inflight[key] = Future()
+                if not leader:
+                    logger.debug(
+                        f"Waiting for in-flight computation of key: {key[:10]}..."
+                    )
+                    return pending.result()
+
+                try:
+                    result = func(*args, **kwargs)
+                    self._put_by_key(key, result, l1_ttl, l2_ttl)
+                    pending.set_result(result)
+                    return result
+                except BaseException as e:
+                    pending.set_exception(e)
+                    raise
+                finally:
+                    with self._inflight_lock:
+                        self._inflight.pop(key, None)
             return wrapper
         return decorator
 
 # --- Helper for File Fingerprinting ---
+# hashlib.file_digest (Python 3.11+) hashes a file in C without per-chunk Python calls
+_file_digest = getattr(hashlib, 'file_digest', None)
+# Read size for the pre-3.11 fallback loop
+_FINGERPRINT_CHUNK_BYTES = 1024 * 1024
+
 def generate_file_fingerprint(file_path: str, algorithm: str = 'sha1') -> Optional[str]:
     """Generates a hash fingerprint for a file's content.
 
@@ -324,10 +635,10 @@ def generate_file_fingerprint(file_path: str, algorithm: str = 'sha1') -> Option
 
     try:
         with open(file_path, 'rb') as f:
-            while True:
-                chunk = f.read(4096) # Read in chunks to handle large files
-                if not chunk:
-                    break
+            if _file_digest is not None:
+                return _file_digest(f, lambda: hasher).hexdigest()
+            # Read in large chunks to handle big files with few Python-level calls
+            for chunk in iter(functools.partial(f.read, _FINGERPRINT_CHUNK_BYTES), b''):
                 hasher.update(chunk)
         return hasher.hexdigest()
     except (FileNotFoundError, PermissionError, OSError) as e:
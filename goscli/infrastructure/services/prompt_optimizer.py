@@ -1,3 +1,5 @@
+import bisect
+import itertools
 import logging
 from typing import List, Optional
 
@@ -43,43 +45,41 @@ class PromptOptimizer:
 
         logger.warning(f"Message list ({estimated_tokens} tokens) exceeds limit ({max_tokens}). Optimizing...")
         
-        optimized_messages: List[ChatMessage] = []
-        current_tokens = TokenCount(0)
         system_prompt: Optional[ChatMessage] = None
+        system_tokens = TokenCount(0)
 
         # Preserve system prompt if it exists at the beginning
         if messages and messages[0]['role'] == 'system':
             system_prompt = messages[0]
-            current_tokens = self.token_estimator.estimate_tokens_for_messages([system_prompt])
+            system_tokens = self.token_estimator.estimate_tokens_for_messages(
+                [system_prompt]
+            )
             # Remove it from the main list for processing
             messages = messages[1:] 
 
-        # Iterate backwards from the most recent message
-        for message in reversed(messages):
-            message_tokens = self.token_estimator.estimate_tokens_for_messages([message]) # Estimate single msg cost
-            
-            # Check if adding this message (plus system prompt if applicable) exceeds the limit
-            potential_total = current_tokens + message_tokens
-            if system_prompt:
-                 # Re-add system prompt tokens if it wasn't accounted for yet
-                 # Note: estimate_tokens_for_messages adds overhead, so this is approximate
-                 if not optimized_messages: # Only add system prompt cost once
-                      potential_total += self.token_estimator.estimate_tokens_for_messages([system_prompt])
-            
-            if potential_total <= max_tokens:
-                optimized_messages.append(message)
-                current_tokens += message_tokens
-            else:
-                # Stop adding messages once the limit is reached
-                logger.debug(f"Stopping message inclusion at limit ({current_tokens} tokens).")
-                break 
-        
+        # Estimate each message once, newest first, and take running totals on
+        # top of the system prompt: totals[k] is the cost of keeping the k most
+        # recent messages. Totals never decrease, so the longest suffix that
+        # fits is found by binary search instead of re-estimating per message.
+        newest_first_tokens = [
+            # Estimate single msg cost
+            self.token_estimator.estimate_tokens_for_messages([message])
+            for message in reversed(messages)
+        ]
+        totals = list(itertools.accumulate(newest_first_tokens, initial=system_tokens))
+        keep = max(0, bisect.bisect_right(totals, max_tokens) - 1)
+        if keep < len(messages):
+            logger.debug(
+                f"Stopping message inclusion at limit ({totals[keep]} tokens)."
+            )
+
+        optimized_messages: List[ChatMessage] = (
+            messages[len(messages) - keep:] if keep else []
+        )
         # Add system prompt back to the beginning if it exists
         if system_prompt:
-             optimized_messages.append(system_prompt)
+             optimized_messages = [system_prompt] + optimized_messages
         
-        # Reverse to restore chronological order
-        optimized_messages.reverse()
         final_token_count = self.token_estimator.estimate_tokens_for_messages(optimized_messages)
         logger.info(f"Optimized message list contains {len(optimized_messages)} messages, {final_token_count} tokens (Limit: {max_tokens}).")
         
@@ -1,8 +1,6 @@
-import time
 import logging
-import collections
-from threading import Lock
-from typing import Deque
+
+from goscli.infrastructure.resilience.sliding_window import SlidingWindow
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +12,12 @@ DEFAULT_MAX_REQUESTS_PER_MINUTE = 5 # Aligns with burst allowance mention
 DEFAULT_MINUTE_TIMEFRAME = 60
 
 class RateLimiter:
-    """Manages API request rate limiting using a sliding window approach."""
+    """Synchronous, thread-safe rate limiter over a SlidingWindow.
+
+    Shares its window implementation with the async
+    `goscli.infrastructure.resilience.rate_limiter.RateLimiter`; only the way
+    callers wait differs.
+    """
 
     def __init__(self,
                  max_requests: int = DEFAULT_MAX_REQUESTS_PER_MINUTE,
@@ -23,65 +26,38 @@ class RateLimiter:
 
         Args:
             max_requests: Maximum number of requests allowed within the timeframe.
-            timeframe_seconds: The duration of the sliding window in seconds.
+            timeframe_seconds: The duration of the timeframe in seconds.
         """
         if max_requests <= 0 or timeframe_seconds <= 0:
             raise ValueError("Max requests and timeframe must be positive.")
             
         self.max_requests = max_requests
         self.timeframe = timeframe_seconds
-        # Use a deque to efficiently store timestamps and remove old ones
-        self.timestamps: Deque[float] = collections.deque()
-        self._lock = Lock() # Thread safety for timestamp access
+        self._window = SlidingWindow(max_requests, timeframe_seconds)
         logger.info(f"RateLimiter initialized: Max {self.max_requests} requests / {self.timeframe} seconds.")
 
-    def _prune_timestamps(self, current_time: float) -> None:
-        """Removes timestamps older than the defined timeframe."""
-        # Remove timestamps older than current_time - timeframe
-        while self.timestamps and self.timestamps[0] <= current_time - self.timeframe:
-            self.timestamps.popleft()
-
     def can_request(self) -> bool:
         """Checks if a request can be made without exceeding the limit."""
-        with self._lock:
-            now = time.monotonic() # Use monotonic clock for duration
-            self._prune_timestamps(now)
-            can_make_request = len(self.timestamps) < self.max_requests
-            # logger.debug(f"Rate limit check: Current count={len(self.timestamps)}, Max={self.max_requests}. Allowed: {can_make_request}")
-            return can_make_request
+        return self._window.has_capacity()
 
     def record_request(self) -> None:
-        """Records the timestamp of a successful request."""
-        with self._lock:
-            now = time.monotonic()
-            self._prune_timestamps(now)
-            if len(self.timestamps) < self.max_requests:
-                self.timestamps.append(now)
-                # logger.debug(f"Request recorded at {now}. Current count: {len(self.timestamps)}")
-            else:
-                # This shouldn't happen if can_request() is checked first, but log if it does
-                logger.warning("Attempted to record request while already at limit.")
+        """Records a successful request in the window."""
+        if not self._window.try_acquire():
+            # This shouldn't happen if can_request() is checked first, but log if it does
+            logger.warning("Attempted to record request while already at limit.")
 
     def wait_time(self) -> float:
         """Calculates the time (in seconds) to wait until the next request can be made.
         
         Returns 0 if a request can be made immediately.
         """
-        with self._lock:
-            now = time.monotonic()
-            self._prune_timestamps(now)
-            
-            if len(self.timestamps) < self.max_requests:
-                return 0.0 # Can request immediately
-            
-            # If limit is reached, calculate wait time based on the oldest timestamp 
-            # within the current window that needs to expire.
-            oldest_relevant_timestamp = self.timestamps[0] # The one that needs to slide out
-            time_passed_since_oldest = now - oldest_relevant_timestamp
-            wait_needed = self.timeframe - time_passed_since_oldest
-            
-            # Add a small buffer to avoid race conditions
-            wait_needed += 0.01 
-            
-            logger.debug(f"Rate limit reached. Wait time calculated: {wait_needed:.2f} seconds.")
-            return max(0.0, wait_needed) # Ensure non-negative wait time 
\ No newline at end of file
+        wait_needed = self._window.time_until_available()
+        
+        if wait_needed == 0.0:
+            return 0.0 # Can request immediately
+        
+        # Add a small buffer to avoid race conditions
+        wait_needed += 0.01 
+        
+        logger.debug(f"Rate limit reached. Wait time calculated: {wait_needed:.2f} seconds.")
+        return wait_needed 
\ No newline at end of file
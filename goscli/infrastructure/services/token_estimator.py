@@ -1,3 +1,4 @@
+import functools
 import logging
 import tiktoken
 from typing import List, Dict, Any
@@ -20,6 +21,19 @@ except Exception as e:
 
 # Approximation fallback
 APPROX_CHARS_PER_TOKEN = 4
+# Longer strings are encoded directly rather than kept alive in the count cache
+_MAX_CACHED_TEXT_CHARS = 16 * 1024
+
+@functools.lru_cache(maxsize=4096)
+def _cached_token_count(text: str) -> int:
+    """Token count for a string, memoized across turns as the history is re-sent."""
+    return len(tokenizer.encode(text))
+
+def _count_tokens(text: str) -> int:
+    """Counts tokens for a message field, using the cache for short strings."""
+    if len(text) <= _MAX_CACHED_TEXT_CHARS:
+        return _cached_token_count(text)
+    return len(tokenizer.encode(text))
 
 class TokenEstimator:
     """Provides methods for estimating token counts using tiktoken with fallback."""
@@ -28,7 +42,7 @@ class TokenEstimator:
         """Estimates token count for a single string."""
         if tokenizer:
             try:
-                return TokenCount(len(tokenizer.encode(text)))
+                return TokenCount(_count_tokens(text))
             except Exception as e:
                 logger.warning(f"Tiktoken text encoding failed: {e}. Falling back to char approx.")
         # Fallback
@@ -56,7 +70,7 @@ class TokenEstimator:
             num_tokens += tokens_per_message
             for key, value in message.items():
                 try:
-                    num_tokens += len(tokenizer.encode(value))
+                    num_tokens += _count_tokens(value)
                 except Exception as e:
                     logger.warning(f"Tiktoken message part encoding failed: {e}. Using char approx for part.")
                     num_tokens += len(value) // APPROX_CHARS_PER_TOKEN
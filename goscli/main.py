@@ -56,7 +56,9 @@ from goscli.infrastructure.optimization.prompt_optimizer import PromptOptimizer
 from goscli.infrastructure.monitoring.logger_setup import setup_logging
 # Localization
 from goscli.infrastructure.localization.language_processor import LanguageProcessor
-from goscli.infrastructure.localization.translation_service import TranslationService
+from goscli.infrastructure.localization.translation_service import (
+    get_translation_service,
+)
 
 # --- Dependency Injection Container (Manual) ---
 
@@ -146,7 +148,9 @@ def create_dependencies() -> Dict[str, Any]:
         logger.info(f"Default AI provider selected: {dependencies['ai_model'].__class__.__name__}")
 
         # Now initialize the translation service with the selected AI model
-        dependencies['translation_service'] = TranslationService(ai_model=dependencies['ai_model'])
+        dependencies['translation_service'] = get_translation_service(
+            ai_model=dependencies['ai_model']
+        )
         dependencies['language_processor'] = LanguageProcessor(translation_service=dependencies['translation_service'])
 
         # Select fallback provider (Example: If default is Groq, fallback is OpenAI)
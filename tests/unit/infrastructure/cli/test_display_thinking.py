@@ -0,0 +1,60 @@
+from unittest.mock import MagicMock
+
+import pytest
+import rich.status
+
+from goscli.infrastructure.cli.display import ConsoleDisplay
+
+
+@pytest.fixture
+def mock_status_cls(monkeypatch):
+    """Fixture replacing rich's Status spinner with a mock class."""
+    status_cls = MagicMock()
+    monkeypatch.setattr(rich.status, "Status", status_cls)
+    return status_cls
+
+@pytest.fixture
+def console_display():
+    """Fixture to create a ConsoleDisplay instance with a mocked console."""
+    display = ConsoleDisplay()
+    display.console = MagicMock()
+    return display
+
+def test_stop_thinking_without_indicator_is_noop(
+    console_display: ConsoleDisplay, mock_status_cls: MagicMock
+):
+    """Test that stop_thinking does nothing when no indicator was shown."""
+    console_display.stop_thinking()
+    mock_status_cls.assert_not_called()
+
+def test_thinking_indicator_is_reused_and_stopped(
+    console_display: ConsoleDisplay, mock_status_cls: MagicMock
+):
+    """Test that the spinner is created once, updated on reuse, and stopped."""
+    spinner = mock_status_cls.return_value
+
+    console_display.display_thinking()
+    console_display.stop_thinking()
+    console_display.display_thinking(message="Still thinking")
+    console_display.stop_thinking()
+
+    mock_status_cls.assert_called_once()
+    assert mock_status_cls.call_args.kwargs["console"] is console_display.console
+    spinner.update.assert_called_once()
+    assert "Still thinking" in spinner.update.call_args.args[0]
+    assert spinner.start.call_count == 2
+    assert spinner.stop.call_count == 2
+    console_display.console.print.assert_not_called() # No fallback text was printed
+
+def test_question_clears_thinking_indicator(
+    console_display: ConsoleDisplay, mock_status_cls: MagicMock
+):
+    """Test that asking a question stops the spinner before prompting."""
+    spinner = mock_status_cls.return_value
+    console_display.console.input.return_value = "y"
+
+    console_display.display_thinking()
+    answer = console_display.ask_yes_no_question("Continue?")
+
+    assert answer is True
+    spinner.stop.assert_called_once()
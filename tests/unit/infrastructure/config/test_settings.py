@@ -0,0 +1,89 @@
+import pytest
+
+from goscli.infrastructure.config import settings
+
+
+@pytest.fixture(autouse=True)
+def isolated_settings(monkeypatch):
+    """Fixture giving settings an empty, already-loaded configuration."""
+    monkeypatch.setattr(settings, "_loaded", True)
+    monkeypatch.setattr(settings, "_config", {})
+    for name in ("INDONESIAN", "COT_IN_ENGLISH"):
+        monkeypatch.delenv(name, raising=False)
+    settings.clear_test_config()
+    yield
+    settings.clear_test_config()
+
+def test_snapshot_is_reused_until_config_changes():
+    """Test that the snapshot is built once and rebuilt after a config change."""
+    snapshot = settings.get_snapshot()
+    assert settings.get_snapshot() is snapshot
+    assert snapshot.use_indonesian is False
+    assert snapshot.cot_in_english is True
+
+    settings.set_config_for_testing({"indonesian": "true"})
+
+    refreshed = settings.get_snapshot()
+    assert refreshed is not snapshot
+    assert refreshed.use_indonesian is True
+    assert settings.use_indonesian() is True
+
+def test_snapshot_ignores_environment_until_invalidated(monkeypatch):
+    """Test that hot lookups are served from the snapshot, not the environment."""
+    assert settings.use_indonesian() is False
+
+    monkeypatch.setenv("INDONESIAN", "true")
+    assert settings.use_indonesian() is False
+
+    settings.clear_test_config()
+    assert settings.use_indonesian() is True
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("true", True),
+        ("FALSE", False),
+        ("42", 42),
+        ("-1.5", -1.5),
+        ("gpt-4o", "gpt-4o"),
+    ],
+)
+def test_get_config_coerces_environment_values(monkeypatch, raw, expected):
+    """Test that environment strings are converted to bools and numbers."""
+    monkeypatch.setenv("GOSCLI_TEST_VALUE", raw)
+
+    value = settings.get_config("goscli_test_value")
+
+    assert value == expected
+    assert type(value) is type(expected)
+
+def test_get_config_rereads_environment(monkeypatch):
+    """Test that environment changes are seen without invalidating the config."""
+    monkeypatch.setattr(settings, "_config", {"goscli_test_value": "from yaml"})
+    monkeypatch.setenv("GOSCLI_TEST_VALUE", "1")
+    assert settings.get_config("goscli_test_value") == 1
+
+    monkeypatch.setenv("GOSCLI_TEST_VALUE", "2")
+    assert settings.get_config("goscli_test_value") == 2
+
+    monkeypatch.delenv("GOSCLI_TEST_VALUE")
+    assert settings.get_config("goscli_test_value") == "from yaml"
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("+5", 5),
+        (" 7", 7),
+        ("1_000", 1000),
+        (".5", 0.5),
+        ("1e3", "1e3"), # Contains a digit but no '.', so only int() is tried
+        ("v1.2.3", "v1.2.3"),
+        ("on", "on"),
+    ],
+)
+def test_coerce_env_value_falls_back_to_int_and_float(raw, expected):
+    """Test that forms the numeric pattern skips still convert like int()/float()."""
+    value = settings._coerce_env_value(raw)
+
+    assert value == expected
+    assert type(value) is type(expected)
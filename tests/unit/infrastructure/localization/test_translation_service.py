@@ -0,0 +1,126 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+import pytest
+
+from goscli.infrastructure.localization import translation_service
+from goscli.infrastructure.localization.translation_service import (
+    TranslationService,
+    get_translation_service,
+)
+
+
+@pytest.fixture
+def indonesian_enabled(monkeypatch):
+    """Fixture forcing Indonesian mode on for the translation service."""
+    monkeypatch.setattr(translation_service, "use_indonesian", lambda: True)
+
+@pytest.fixture
+def fresh_shared_service(monkeypatch):
+    """Fixture resetting the process-wide TranslationService."""
+    monkeypatch.setattr(translation_service, "_shared_service", None)
+
+def _mock_ai_model(content: str = "Halo dunia") -> MagicMock:
+    """Builds an AI model mock whose generate_content returns `content`."""
+    model = MagicMock()
+    model.generate_content.return_value = MagicMock(content=content)
+    return model
+
+def test_translations_are_cached(indonesian_enabled):
+    """Test that translating the same text twice calls the AI model once."""
+    model = _mock_ai_model()
+    service = TranslationService(ai_model=model)
+
+    assert service.translate_to_indonesian("Hello world") == "Halo dunia"
+    assert service.translate_to_indonesian("Hello world") == "Halo dunia"
+    model.generate_content.assert_called_once()
+
+def test_get_translation_service_returns_shared_instance(fresh_shared_service):
+    """Test that repeated calls return one instance and attach a late AI model once."""
+    first = get_translation_service()
+    assert first.ai_model is None
+
+    model = _mock_ai_model()
+    second = get_translation_service(ai_model=model)
+    third = get_translation_service(ai_model=_mock_ai_model())
+
+    assert first is second is third
+    assert first.ai_model is model # Not replaced by the third call's model
+
+def test_translate_async_runs_in_worker_thread(indonesian_enabled):
+    """Test that the async variant translates off the event loop thread."""
+    model = _mock_ai_model()
+    threads = []
+    model.generate_content.side_effect = lambda messages: (
+        threads.append(threading.get_ident()) or MagicMock(content="Halo dunia")
+    )
+    service = TranslationService(ai_model=model)
+
+    result = asyncio.run(service.translate_to_indonesian_async("Hello world"))
+
+    assert result == "Halo dunia"
+    assert threads and threads[0] != threading.get_ident()
+
+def test_translate_async_skips_when_disabled(monkeypatch):
+    """Test that the async variant returns the text unchanged when Indonesian is off."""
+    monkeypatch.setattr(translation_service, "use_indonesian", lambda: False)
+    model = _mock_ai_model()
+    service = TranslationService(ai_model=model)
+
+    result = asyncio.run(service.translate_to_indonesian_async("Hello world"))
+
+    assert result == "Hello world"
+    model.generate_content.assert_not_called()
+
+def test_waiters_fall_back_when_leader_is_interrupted(monkeypatch):
+    """Test that callers waiting on an interrupted translation are released."""
+
+    class Interrupted(BaseException):
+        pass
+
+    started = threading.Event()
+    release = threading.Event()
+    blocked = threading.Semaphore(0)
+
+    class CountingFuture(Future):
+        def result(self, timeout=None):
+            blocked.release()
+            return super().result(timeout)
+
+    monkeypatch.setattr(translation_service, "Future", CountingFuture)
+    model = MagicMock()
+
+    def generate_content(messages):
+        started.set()
+        release.wait(5)
+        raise Interrupted()
+
+    model.generate_content.side_effect = generate_content
+    service = TranslationService(ai_model=model)
+    outcome = {}
+
+    def lead():
+        try:
+            service._translate_full_text("Hello")
+        except Interrupted:
+            outcome["leader"] = "interrupted"
+
+    def wait():
+        outcome["waiter"] = service._translate_full_text("Hello")
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    started.wait(5)
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    assert blocked.acquire(timeout=5) # Waiter is blocked on the leader's call
+    release.set()
+    leader.join(5)
+    waiter.join(5)
+
+    assert not waiter.is_alive()
+    assert outcome["leader"] == "interrupted"
+    assert outcome["waiter"].startswith("[Terjemahan sederhana - fallback mode]")
+    assert service._inflight == {}
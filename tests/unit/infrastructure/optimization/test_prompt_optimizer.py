@@ -0,0 +1,60 @@
+from goscli.infrastructure.optimization.prompt_optimizer import PromptOptimizer
+
+
+class _LengthEstimator:
+    """Fake TokenEstimator: one token per content character plus overheads."""
+
+    def __init__(self):
+        self.list_calls = 0
+
+    def estimate_tokens_for_message(self, message):
+        return len(message["content"]) + 1
+
+    def estimate_tokens_for_messages(self, messages):
+        self.list_calls += 1
+        return 2 + sum(self.estimate_tokens_for_message(m) for m in messages)
+
+def _history(count: int, size: int = 20):
+    """Builds a system prompt followed by `count` user messages."""
+    system = {"role": "system", "content": "s" * 10}
+    return [system] + [
+        {"role": "user", "content": str(i) * size} for i in range(count)
+    ]
+
+def test_truncation_keeps_newest_messages_that_fit():
+    """Test that the cutoff keeps the system prompt and the newest messages."""
+    estimator = _LengthEstimator()
+    optimizer = PromptOptimizer(estimator)
+    messages = _history(6) # 2 + 11 + 6 * 21 = 139 tokens
+
+    result = optimizer.optimize_messages(messages, max_tokens=70)
+
+    assert result == [messages[0]] + messages[-2:]
+    # Start estimate, empty-list overhead and one final safety check: the
+    # cutoff is found by bisection rather than by re-estimating per removal
+    assert estimator.list_calls == 3
+
+def test_truncation_cutoff_at_exact_limit():
+    """Test that a suffix whose total equals max_tokens is kept whole."""
+    optimizer = PromptOptimizer(_LengthEstimator())
+    messages = _history(6) # Keeping two messages costs exactly 2 + 11 + 42
+
+    assert optimizer.optimize_messages(messages, max_tokens=55) == (
+        [messages[0]] + messages[-2:]
+    )
+    assert optimizer.optimize_messages(messages, max_tokens=54) == (
+        [messages[0]] + messages[-1:]
+    )
+
+def test_truncation_without_system_prompt():
+    """Test that the oldest messages are dropped when there is no system prompt."""
+    optimizer = PromptOptimizer(_LengthEstimator())
+    messages = _history(6)[1:]
+
+    assert optimizer.optimize_messages(messages, max_tokens=50) == messages[-2:]
+
+def test_truncation_fails_when_system_prompt_alone_is_too_long():
+    """Test that an empty list is returned if even the system prompt does not fit."""
+    optimizer = PromptOptimizer(_LengthEstimator())
+
+    assert optimizer.optimize_messages(_history(3), max_tokens=12) == []
@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import pytest
+
+from goscli.infrastructure.resilience import sliding_window
+from goscli.infrastructure.resilience.rate_limiter import RateLimiter
+from goscli.infrastructure.resilience.sliding_window import SlidingWindow
+from goscli.infrastructure.services import rate_limiter as services_rate_limiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fixture replacing time.monotonic_ns with a manually advanced clock."""
+    now = [0]
+    monkeypatch.setattr(sliding_window.time, "monotonic_ns", lambda: now[0])
+
+    def advance(seconds: float) -> None:
+        now[0] += int(seconds * sliding_window.NS_PER_SECOND)
+
+    return advance
+
+def test_waiters_are_granted_in_fifo_order():
+    """Test that callers queued on a full window are granted in arrival order."""
+    limiter = RateLimiter(max_requests=1, time_window=0.05)
+    granted = []
+
+    async def request(name: str) -> None:
+        await limiter.wait_for_permission()
+        granted.append(name)
+
+    async def main() -> None:
+        await asyncio.gather(*(request(name) for name in "abcd"))
+
+    asyncio.run(main())
+
+    assert granted == ["a", "b", "c", "d"]
+    assert not limiter._waiters
+
+def test_cancelled_waiter_is_dropped_from_queue():
+    """Test that cancelling a queued caller does not consume a later slot."""
+    limiter = RateLimiter(max_requests=1, time_window=0.05)
+
+    async def main() -> None:
+        await limiter.wait_for_permission()
+        cancelled = asyncio.ensure_future(limiter.wait_for_permission())
+        waiting = asyncio.ensure_future(limiter.wait_for_permission())
+        await asyncio.sleep(0) # Let both callers queue up
+        assert len(limiter._waiters) == 2
+
+        cancelled.cancel()
+        await asyncio.wait_for(waiting, timeout=1)
+
+        assert cancelled.cancelled()
+        assert not limiter._waiters
+
+    asyncio.run(main())
+
+def test_async_limiter_never_exceeds_max_per_window():
+    """Test that no two grants more than max_requests apart are within the window."""
+    limiter = RateLimiter(max_requests=2, time_window=0.1)
+    granted = []
+
+    async def request() -> None:
+        await limiter.wait_for_permission()
+        granted.append(time.monotonic())
+
+    async def main() -> None:
+        await asyncio.gather(*(request() for _ in range(6)))
+
+    asyncio.run(main())
+
+    gaps = [later - earlier for earlier, later in zip(granted, granted[2:])]
+    assert min(gaps) >= 0.08 # Window minus scheduling jitter
+
+def test_sliding_window_frees_slots_one_window_after_grant(clock):
+    """Test that the window grants max_requests, then one slot per expiry."""
+    window = SlidingWindow(max_requests=2, time_window=1.0)
+
+    assert window.try_acquire()
+    clock(0.25)
+    assert window.try_acquire()
+    assert not window.try_acquire()
+    assert window.time_until_available() == pytest.approx(0.75)
+
+    clock(0.75) # First grant leaves the window
+    assert window.has_capacity()
+    assert window.try_acquire()
+    assert not window.has_capacity()
+    assert window.time_until_available() == pytest.approx(0.25)
+
+def test_sliding_window_rejects_invalid_limits():
+    """Test that non-positive limits are refused."""
+    with pytest.raises(ValueError):
+        SlidingWindow(max_requests=0, time_window=1.0)
+    with pytest.raises(ValueError):
+        SlidingWindow(max_requests=1, time_window=0)
+
+def test_sync_limiter_grants_at_most_max_per_timeframe(clock):
+    """Test that polling the sync limiter for a whole timeframe grants max_requests."""
+    limiter = services_rate_limiter.RateLimiter(max_requests=5, timeframe_seconds=1)
+    granted = 0
+
+    for _ in range(10): # Poll every 0.1s across one timeframe
+        if limiter.can_request():
+            limiter.record_request()
+            granted += 1
+        clock(0.1)
+
+    assert granted == 5
+    assert limiter.can_request() # The first grant has left the window
+    assert limiter.wait_time() == 0.0
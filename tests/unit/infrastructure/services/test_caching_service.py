@@ -0,0 +1,199 @@
+import os
+import threading
+from concurrent.futures import Future
+
+import diskcache as dc
+import pytest
+
+from goscli.infrastructure.services import caching_service
+from goscli.infrastructure.services.caching_service import (
+    CachingService,
+    _FrequencySketch,
+)
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    """Fixture providing a fresh L2 cache directory."""
+    return str(tmp_path / "cache")
+
+@pytest.fixture
+def cache(cache_dir: str):
+    """Fixture to create a CachingService backed by a temporary directory."""
+    service = CachingService(cache_dir=cache_dir)
+    yield service
+    service.close()
+
+@pytest.fixture
+def blocked_callers(monkeypatch):
+    """Fixture counting callers that wait on an in-flight cache_result call."""
+    count = threading.Semaphore(0)
+
+    class CountingFuture(Future):
+        def result(self, timeout=None):
+            count.release()
+            return super().result(timeout)
+
+    monkeypatch.setattr(caching_service, "Future", CountingFuture)
+    return count
+
+def _l1_values(cache: CachingService) -> set:
+    """Returns the values currently held in the L1 cache."""
+    return {value for value, _ in cache._memory_cache.values()}
+
+def test_frequency_sketch_counts_and_decays():
+    """Test that the sketch counts accesses and halves them once per sample."""
+    sketch = _FrequencySketch(100) # Halves after 1000 accesses
+
+    for _ in range(3):
+        sketch.increment("key")
+    assert sketch.frequency("key") == 3
+
+    for _ in range(997):
+        sketch.increment("key")
+    assert sketch.frequency("key") == 7 # Saturated at 15, then halved
+
+def test_l1_rejects_one_off_key_when_full(cache: CachingService):
+    """Test that a key seen once does not displace a more frequent LRU entry."""
+    cache._l1_max_size = 2
+    cache.put("hot", "prefix", "hot")
+    cache.put("warm", "prefix", "warm")
+    for _ in range(3):
+        cache.get("prefix", "warm")
+        cache.get("prefix", "hot")
+
+    cache.put("once", "prefix", "once")
+
+    assert _l1_values(cache) == {"hot", "warm"}
+
+def test_l1_admits_key_once_it_is_frequent(cache: CachingService):
+    """Test that a repeatedly requested key eventually evicts the LRU entry."""
+    cache._l1_max_size = 2
+    cache.put("hot", "prefix", "hot")
+    cache.put("warm", "prefix", "warm")
+    cache.get("prefix", "warm")
+    cache.get("prefix", "hot") # "warm" is now least recently used
+
+    for _ in range(3):
+        cache.put("new", "prefix", "new")
+
+    assert _l1_values(cache) == {"hot", "new"}
+
+def test_cache_result_coalesces_concurrent_misses(
+    cache: CachingService, blocked_callers
+):
+    """Test that concurrent misses on one key run the wrapped function once."""
+    release = threading.Event()
+    calls = []
+
+    @cache.cache_result("slow")
+    def slow(x):
+        calls.append(x)
+        release.wait(5)
+        return x * 2
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(slow(21))) for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    # Let the four non-leaders block on the in-flight call before it finishes
+    for _ in range(4):
+        assert blocked_callers.acquire(timeout=5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [21]
+    assert results == [42] * 5
+    assert cache._inflight == {}
+
+def test_cache_result_shares_leader_exception(
+    cache: CachingService, blocked_callers
+):
+    """Test that waiters see the leader's exception and a later call retries."""
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    @cache.cache_result("flaky")
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+            raise RuntimeError("boom")
+        return "ok"
+
+    errors = []
+
+    def call():
+        try:
+            flaky()
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    waiter = threading.Thread(target=call)
+    waiter.start()
+    assert blocked_callers.acquire(timeout=5)
+    release.set()
+    leader.join(5)
+    waiter.join(5)
+
+    assert errors == ["boom", "boom"]
+    assert flaky() == "ok"
+    assert len(calls) == 2
+
+def test_get_many_returns_only_hits(cache: CachingService):
+    """Test that get_many maps each found args entry to its value."""
+    cache.put_many("prefix", {"a": 1, ("b", 2): "two"})
+
+    hits = cache.get_many("prefix", ["a", ("b", 2), "missing"])
+
+    assert hits == {"a": 1, ("b", 2): "two"}
+
+def test_get_many_matches_single_get(cache: CachingService):
+    """Test that put_many/get_many use the same keys as put/get."""
+    cache.put("single", "prefix", "x", 3)
+    cache.put_many("prefix", {"y": "many"})
+
+    assert cache.get_many("prefix", [("x", 3)]) == {("x", 3): "single"}
+    assert cache.get("prefix", "y") == "many"
+
+def test_close_flushes_pending_l2_writes(cache_dir: str):
+    """Test that closing flushes queued L2 writes so a new instance can read them."""
+    writer = CachingService(cache_dir=cache_dir)
+    writer.put_many("prefix", {"a": 1, "b": 2})
+    writer.close()
+
+    reader = CachingService(cache_dir=cache_dir)
+    try:
+        assert reader._memory_cache == {}
+        assert reader.get_many("prefix", ["a", "b", "c"]) == {"a": 1, "b": 2}
+        # L2 hits are promoted to L1
+        assert len(reader._memory_cache) == 2
+    finally:
+        reader.close()
+
+def test_l2_uses_shards_subdir_and_removes_legacy_cache(cache_dir: str):
+    """Test that the pre-sharding cache.db is deleted and shards get their own dir."""
+    with dc.Cache(cache_dir) as legacy:
+        legacy.set("old-key", "x" * 100_000) # Large enough for a separate file
+
+    service = CachingService(cache_dir=cache_dir)
+    try:
+        assert not os.path.exists(os.path.join(cache_dir, "cache.db"))
+        shards_dir = os.path.join(cache_dir, caching_service.L2_SHARDS_SUBDIR)
+        assert service.disk_cache.directory == shards_dir
+        assert os.path.isfile(os.path.join(shards_dir, "000", "cache.db"))
+        leftover = [
+            name for _, _, files in os.walk(cache_dir) for name in files
+            if name.endswith(".val")
+        ]
+        assert leftover == []
+    finally:
+        service.close()
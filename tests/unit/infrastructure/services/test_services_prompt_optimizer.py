@@ -0,0 +1,47 @@
+from goscli.infrastructure.services.prompt_optimizer import PromptOptimizer
+
+
+class _LengthEstimator:
+    """Fake TokenEstimator: one token per content character plus overheads."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def estimate_tokens_for_messages(self, messages):
+        self.calls += 1
+        return 2 + sum(len(m["content"]) + 1 for m in messages)
+
+def _history(count: int, size: int = 20):
+    """Builds a system prompt followed by `count` user messages."""
+    system = {"role": "system", "content": "s" * 10}
+    return [system] + [
+        {"role": "user", "content": str(i) * size} for i in range(count)
+    ]
+
+def test_optimize_keeps_newest_suffix_that_fits():
+    """Test that the system prompt and the longest fitting suffix are kept."""
+    estimator = _LengthEstimator()
+    optimizer = PromptOptimizer(estimator)
+    messages = _history(5) # System costs 13, each message 23 on its own
+
+    result = optimizer.optimize_messages(messages, max_tokens=59)
+
+    assert result == [messages[0]] + messages[-2:]
+    # Full list, system prompt, each message once and the final count
+    assert estimator.calls == len(messages) + 2
+
+def test_optimize_cutoff_just_below_limit():
+    """Test that one token short of a suffix's total drops its oldest message."""
+    optimizer = PromptOptimizer(_LengthEstimator())
+    messages = _history(5)
+
+    assert optimizer.optimize_messages(messages, max_tokens=58) == (
+        [messages[0]] + messages[-1:]
+    )
+
+def test_optimize_returns_input_when_within_limit():
+    """Test that a list under the limit is returned without truncation."""
+    optimizer = PromptOptimizer(_LengthEstimator())
+    messages = _history(2)
+
+    assert optimizer.optimize_messages(messages, max_tokens=1000) is messages